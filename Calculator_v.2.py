@@ -4,8 +4,6 @@ import math
 import json
 import os
 from typing import Union
-import matplotlib.pyplot as plt
-import numpy as np
 
 class Calculator:
     def __init__(self, root):
@@ -848,6 +846,9 @@ class Calculator:
                 return 0
 
     def line(self, a, b):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y = a * x + b
         plt.figure(figsize=(10, 10))
@@ -903,6 +904,9 @@ class Calculator:
         return "График построен"
 
     def parabola(self, a, b, c):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y = a * x ** 2 + b * x + c
         plt.figure(figsize=(10, 10))
@@ -983,6 +987,9 @@ class Calculator:
         return "График построен"
 
     def hiperbola(self, a, b, c):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y = a / (x + b) + c
         plt.figure(figsize=(10, 10))
@@ -1040,6 +1047,9 @@ class Calculator:
         return "График построен"
 
     def circle(self, a, b, c):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         t = np.linspace(0, 2 * np.pi, 100)
         x = a + c * np.cos(t)
         y = b + c * np.sin(t)
@@ -1084,6 +1094,9 @@ class Calculator:
         return "График построен"
 
     def moduleX(self, a, b, c):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y = a * np.abs(x + b) + c
 
@@ -1159,6 +1172,9 @@ class Calculator:
         return "График построен"
 
     def moduleY(self, a, b):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-10, 10, 400)
         y_plus = a * x + b
         y_minus = -a * x - b
@@ -1218,6 +1234,9 @@ class Calculator:
         return "График построен"
 
     def moduleXY(self, a, b):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y_plus = a * np.abs(x) + b
         y_minus = -a * np.abs(x) - b
@@ -1277,6 +1296,9 @@ class Calculator:
         return "График построен"
 
     def sinus(self, a, b):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y = a * np.sin(x) + b
 
@@ -1334,6 +1356,9 @@ class Calculator:
         return "График построен"
 
     def cosinus(self, a, b):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y = a * np.cos(x) + b
 
@@ -1391,6 +1416,9 @@ class Calculator:
         return "График построен"
 
     def tang(self, a, b):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-11, 11, 400)
         y = a * np.tan(x) + b
 
@@ -1448,6 +1476,9 @@ class Calculator:
         return "График построен"
 
     def cotang(self, a, b):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-10, 10, 400)
         y = a / np.tan(x) + b
 
@@ -1505,6 +1536,9 @@ class Calculator:
         return "График построен"
 
     def heart(self, a):
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         x = np.linspace(-1.5, 1.5, 1000) * a
         y = np.linspace(-1.5, 1.5, 1000) * a
         X, Y = np.meshgrid(x, y)
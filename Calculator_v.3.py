@@ -1,11 +1,38 @@
+import time
+
+STARTUP = time.perf_counter()
+
 import tkinter as tk
-from tkinter import font, ttk, messagebox
+from tkinter import font, ttk, messagebox, filedialog
 import math
 import json
-import os
+import sys
+import threading
+from decimal import Context, Decimal, InvalidOperation, Overflow as DecimalOverflow
+from fractions import Fraction
 from typing import Union
-import matplotlib.pyplot as plt
-import numpy as np
+from calc_engine import CalcEngine
+from calc_expr import INTERACTIVE_BITS, NumberTooLarge
+from calc_factor import CACHE_FILE as FACTOR_CACHE_FILE
+from calc_factorial import describe
+from calc_history import RETENTION as HISTORY_RETENTION, HistoryStore
+from calc_metrics import PERCENTILES, format_duration, format_size
+from calc_precision import MAX_DIGITS, Precision
+from calc_widgets import VirtualList
+from calc_worker import Worker
+
+IMPORT_TIME = time.perf_counter() - STARTUP
+
+SPINNER = "◐◓◑◒"
+POLL_INTERVAL = 100
+# Первый опрос ждёт ответа чуть дольше: быстрые вычисления обходятся без спиннера
+FIRST_POLL_WAIT = 0.02
+# Операции дешевле этого (по оценке calc_parallel.estimate) считаются прямо в окне
+INLINE_COST = 10 ** 4
+DIAGNOSTICS_INTERVAL = 1000
+# Не чаще 60 кадров в секунду; промежуточные положения ползунков отбрасываются
+FRAME_INTERVAL = 16
+SLIDER_RANGE = 10
 
 class Calculator:
     def __init__(self, root):
@@ -15,6 +42,7 @@ class Calculator:
 
         self.language = "ru"
         self.current_theme = "dark"
+        self.history_retention = HISTORY_RETENTION
 
         self.translations = {
             "ru": {
@@ -23,7 +51,9 @@ class Calculator:
                 "theme": "Тема",
                 "light": "Светлая",
                 "dark": "Тёмная",
-                "calculate": "Вычислить"
+                "calculate": "Вычислить",
+                "precision": "Точность",
+                "digits": "Значащих цифр (Decimal)"
             },
             "en": {
                 "settings": "Settings",
@@ -31,7 +61,78 @@ class Calculator:
                 "theme": "Theme",
                 "light": "Light",
                 "dark": "Dark",
-                "calculate": "Calculate"
+                "calculate": "Calculate",
+                "precision": "Precision",
+                "digits": "Significant digits (Decimal)",
+                "⟳ Сброс": "⟳ Reset",
+                "История": "History",
+                "Настройки": "Settings",
+                "ОПЕРАЦИИ": "OPERATIONS",
+                "ВВОД": "INPUT",
+                "РЕЗУЛЬТАТ": "RESULT",
+                "Строки для ввода переменных": "Input fields for variables",
+                "ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ": "CHOOSE AN OPERATION AND FILL IN THE FIELDS",
+                "Вычислить": "Calculate",
+                "Копировать": "Copy",
+                "Скопировано!": "Copied!",
+                "Отмена": "Cancel",
+                "Диагностика": "Diagnostics",
+                "ДИАГНОСТИКА": "DIAGNOSTICS",
+                "Экспорт": "Export",
+                "Сбросить": "Reset",
+                "Операция": "Operation",
+                "Вызовов": "Calls",
+                "Ошибок": "Errors",
+                "CPU p95": "CPU p95",
+                "Размер p95": "Size p95",
+                "Нет данных": "No data",
+                "Живой режим": "Live mode",
+                "Вычисление...": "Calculating...",
+                "Вычисление отменено": "Calculation cancelled",
+                "ИСТОРИЯ": "HISTORY",
+                "Очистить": "Clear",
+                "История пуста": "History is empty",
+                "Ничего не найдено": "Nothing found",
+                "АРИФМЕТИКА": "ARITHMETIC",
+                "ЧИСЛА": "NUMBERS",
+                "ГЕОМЕТРИЯ": "GEOMETRY",
+                "АЛГЕБРА": "ALGEBRA",
+                "ФУНКЦИИ": "FUNCTIONS",
+                "ГРАФИКИ": "GRAPHS",
+                "Сложение": "Addition",
+                "Вычитание": "Subtraction",
+                "Умножение": "Multiplication",
+                "Деление": "Division",
+                "Степень": "Power",
+                "Корень числа": "Square root",
+                "Факториал": "Factorial",
+                "Дв-й Факториал": "Double fact.",
+                "Простое?": "Prime?",
+                "Множители": "Factors",
+                "НОД": "GCD",
+                "НОК": "LCM",
+                "Синус": "Sine",
+                "Косинус": "Cosine",
+                "Тангенс": "Tangent",
+                "Котангенс": "Cotangent",
+                "Уравнение Х": "Equation X",
+                "Уравнение Х²": "Equation X²",
+                "Логарифм": "Logarithm",
+                "Модуль": "Absolute",
+                "Дробная Часть": "Fractional",
+                "Целая Часть": "Integer part",
+                "Прямая": "Line",
+                "Парабола": "Parabola",
+                "Гипербола": "Hyperbola",
+                "Синусоида": "Sine wave",
+                "Косинусоида": "Cosine wave",
+                "Тангенсоида": "Tangent curve",
+                "Окружность": "Circle",
+                "Модуль Х": "Abs X",
+                "Модуль Y": "Abs Y",
+                "Модуль Y и Х": "Abs Y and X",
+                "Котангенсоида": "Cotangent curve",
+                "Сердце": "Heart"
             },
         }
 
@@ -67,7 +168,7 @@ class Calculator:
             "Косинусоида": "y = a×cos(x) + b",
             "Тангенсоида": "y = a×tg(x) + b",
             "Окружность": "(y-a)² + (x-b)² = c²",
-            "Модуль Х": "y = a|x| + b",
+            "Модуль Х": "y = a|x + b| + c",
             "Модуль Y": "|y| = ax + b",
             "Модуль Y и Х": "|y| = a|x| + b",
             "Котангенсоида": "y = a×ctg(x) + b",
@@ -117,44 +218,153 @@ class Calculator:
             }
         }
 
-        self.root.configure(bg=self.colors['bg'])
+        # Графики не кэшируются: они рисуют на панели, а не возвращают значение
+        self.engine = CalcEngine(cache_path='calc_cache.jsonl')
+        for name, arity in [
+            ("line", 2),
+            ("parabola", 3),
+            ("hyperbola", 3),
+            ("cosinus", 2),
+            ("sinus", 2),
+            ("tang", 2),
+            ("circle", 3),
+            ("moduleX", 3),
+            ("moduleY", 2),
+            ("moduleXY", 2),
+            ("cotang", 2),
+            ("heart", 1)
+        ]:
+            self.engine.register(name, arity, self.plot_operation(getattr(self, name)))
+        self.load_settings()
+
+        self.timings = {"import": IMPORT_TIME}
+
+        self.styled = {}
+        self.style(self.root, bg='bg')
+
+        started = time.perf_counter()
         self.setup_fonts()
+        self.timings["fonts"] = time.perf_counter() - started
+
+        started = time.perf_counter()
         self.setup_variables()
         self.create_layout()
+        self.timings["layout"] = time.perf_counter() - started
+
+        started = time.perf_counter()
         self.load_history()
+        self.timings["history"] = time.perf_counter() - started
 
         self.bind_keys()
 
         self.root.after(100, self.center_window)
-
-    def refresh_ui(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-        self.setup_fonts()
-        self.create_layout()
+        self.root.after_idle(self.on_shown)
+
+    def style(self, widget, text=None, **roles):
+        # Запоминаем смысловые роли цвета и текста, чтобы переключать тему и язык на месте
+        key = str(widget)
+        if key not in self.styled:
+            widget.bind('<Destroy>', lambda e: self.styled.pop(key, None) if e.widget is widget else None, add='+')
+        self.styled[key] = (widget, text, roles)
+        self.apply_style(widget, text, roles)
+        return widget
+
+    def apply_style(self, widget, text, roles):
+        options = {option: self.colors[role] for option, role in roles.items()}
+        if text is not None:
+            options['text'] = self.t(text)
+        widget.configure(**options)
+
+    def apply_styles(self):
+        for widget, text, roles in list(self.styled.values()):
+            self.apply_style(widget, text, roles)
+
+    def plot_operation(self, method):
+        # В точных режимах коэффициенты приходят как Decimal или Fraction, а numpy умеет только float
+        def run(*args):
+            return method(*(a if isinstance(a, int) else float(a) for a in args))
+        return run
 
     def save_settings(self):
         data = {
             "language": self.language,
-            "theme": self.current_theme
+            "theme": self.current_theme,
+            "precision": self.engine.precision.mode,
+            "digits": self.engine.precision.digits,
+            "history_retention": self.history_retention
         }
-        with open("settings.json", "w") as f:
-            json.dump(data, f)
+        try:
+            with open("settings.json", "w") as f:
+                json.dump(data, f)
+        except OSError:
+            pass
+
+    def load_settings(self):
+        try:
+            with open("settings.json", "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("language") in self.translations:
+            self.language = data["language"]
+        if data.get("theme") in self.themes:
+            self.current_theme = data["theme"]
+            self.colors = self.themes[self.current_theme].copy()
+        try:
+            self.engine.precision = Precision(data.get("precision", "float"), data.get("digits", self.engine.precision.digits))
+        except (ValueError, TypeError):
+            pass
+        # Сколько записей истории хранить в памяти и в журнале
+        retention = data.get("history_retention")
+        if isinstance(retention, int) and not isinstance(retention, bool) and retention > 0:
+            self.history_retention = retention
 
     def change_theme(self, theme):
         self.current_theme = theme
         self.colors = self.themes[theme].copy()
-        self.root.configure(bg=self.colors['bg'])
-        self.refresh_ui()
+        self.apply_styles()
+        self.save_settings()
 
     def t(self, key):
         return self.translations[self.language].get(key, key)
 
-    def setup_plot(self):
-        plt.axhline(y=0, color='black', linewidth=2.5)
-        plt.axvline(y=0, color='black', linewidth=2.5)
-        plt.grid(True, alpha=0.3)
+    def show_plot(self, curves, title, xlim=None, ylim=None, color='b'):
+        from calc_plot import PlotPanel
+
+        if self.plot_panel is None:
+            self.plot_panel = self.style(PlotPanel(self.plot_container, self.colors['surface']), bg='surface')
+            self.plot_panel.pack(fill='both', expand=True, padx=20, pady=(20, 0))
+            self.plot_panel.bind_view(self.change_view)
+        if xlim is None:
+            xlim, ylim = self.viewport()
+        self.plot_panel.show(curves, title, xlim, ylim, color)
+
+    def viewport(self, default=None):
+        # Область, выбранная колесом и перетаскиванием, иначе - исходная область графика
+        if self.view is not None:
+            return self.view
+        if default is None:
+            from calc_sampling import VIEW
+            default = VIEW
+        return default, default
+
+    def change_view(self, xlim, ylim):
+        if self.graph is None:
+            return
+        self.view = (tuple(xlim), tuple(ylim)) if xlim is not None else None
+        # Как и в живом режиме: события между кадрами сливаются в один пересчёт
+        if self.view_job is None:
+            wait = FRAME_INTERVAL - (time.perf_counter() - self.view_rendered) * 1000
+            self.view_job = self.root.after(max(0, int(wait)), self.render_view)
+
+    def render_view(self):
+        self.view_job = None
+        self.view_rendered = time.perf_counter()
+        name, args = self.graph
+        try:
+            self.engine.evaluate(name, *args)
+        except Exception as e:
+            self.show_error(e)
 
     def setup_fonts(self):
         self.font_title = font.Font(family="SF Pro Display", size=24, weight="bold")
@@ -173,19 +383,33 @@ class Calculator:
             pass
 
     def setup_variables(self):
-        self.current_function = None
+        self.current_operation = None
+        self.plot_panel = None
+        self.graph = None
+        self.view = None
+        self.view_job = None
+        self.view_rendered = 0.0
+        # Разложения на множители переживают перезапуск только у окна, не у CLI и пула процессов
+        self.worker = Worker(factor_path=FACTOR_CACHE_FILE)
+        self.job = None
+        self.poll_id = None
+        self.live_var = tk.BooleanVar(value=False)
+        self.live_vars = []
+        self.live_sliders = []
+        self.live_job = None
+        self.live_dirty = False
+        self.live_rendered = 0.0
         self.input_fields = []
-        self.history = []
-        self.result_var = tk.StringVar(value="ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ")
+        self.result_var = tk.StringVar(value=self.t("ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ"))
         self.expression_var = tk.StringVar(value="")
 
     def create_layout(self):
-        main_container = tk.Frame(self.root, bg=self.colors['bg'])
+        main_container = self.style(tk.Frame(self.root), bg='bg')
         main_container.pack(fill='both', expand=True, padx=20, pady=20)
 
         self.create_header(main_container)
 
-        content_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        content_frame = self.style(tk.Frame(main_container), bg='bg')
         content_frame.pack(fill='both', expand=True, pady=20)
 
         left_panel = self.create_left_panel(content_frame)
@@ -195,132 +419,151 @@ class Calculator:
         right_panel.pack(side='right', fill='both', expand=True, padx=(20, 0))
 
     def change_language(self, lang):
+        placeholder = self.t("ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ")
         self.language = lang
-        self.refresh_ui()
+        if self.result_var.get() == placeholder:
+            self.result_var.set(self.t("ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ"))
+        self.apply_styles()
+        self.save_settings()
 
     def open_settings(self):
-        settings = tk.Toplevel(self.root)
-        settings.title("Настройки")
-        settings.geometry("400x300")
-        settings.configure(bg=self.colors['bg'])
+        settings = self.style(tk.Toplevel(self.root), bg='bg')
+        settings.title(self.t("settings"))
+        settings.geometry("400x480")
         settings.transient(self.root)
 
-        tk.Label(
+        self.style(tk.Label(
             settings,
-            text="Настройки",
-            font=self.font_title,
-            bg=self.colors['bg'],
-            fg=self.colors['text']
-        ).pack(pady=20)
+            font=self.font_title
+        ), text="settings", bg='bg', fg='text').pack(pady=20)
 
         lang_var = tk.StringVar(value=self.language)
 
-        tk.Label(settings, text=self.t("language"),
-                 bg=self.colors['bg'], fg=self.colors['text']).pack()
+        self.style(tk.Label(settings), text="language", bg='bg', fg='text').pack()
 
-        tk.Radiobutton(settings, text="Русский", variable=lang_var, value="ru",
-                       bg=self.colors['bg'], fg=self.colors['text'],
-                       command=lambda:self.change_language(lang_var.get())
-        ).pack()
+        self.style(tk.Radiobutton(settings, text="Русский", variable=lang_var, value="ru",
+                                  command=lambda: self.change_language(lang_var.get())
+        ), bg='bg', fg='text', selectcolor='surface').pack()
 
-        tk.Radiobutton(settings, text="English", variable=lang_var, value="en",
-                       bg=self.colors['bg'], fg=self.colors['text'],
-                       command=lambda: self.change_language(lang_var.get())
-        ).pack()
+        self.style(tk.Radiobutton(settings, text="English", variable=lang_var, value="en",
+                                  command=lambda: self.change_language(lang_var.get())
+        ), bg='bg', fg='text', selectcolor='surface').pack()
 
-        theme_var = tk.StringVar(value="dark")
+        theme_var = tk.StringVar(value=self.current_theme)
 
-        tk.Label(settings, text=self.t("theme"),
-                 bg=self.colors['bg'], fg=self.colors['text']).pack()
+        self.style(tk.Label(settings), text="theme", bg='bg', fg='text').pack()
 
-        tk.Radiobutton(
-            settings, text=self.t("dark"),
+        self.style(tk.Radiobutton(
+            settings,
             variable=theme_var, value="dark",
-            command=lambda: self.change_theme("dark"),
-            bg=self.colors['bg'], fg=self.colors['text']
-        ).pack()
+            command=lambda: self.change_theme("dark")
+        ), text="dark", bg='bg', fg='text', selectcolor='surface').pack()
 
-        tk.Radiobutton(
-            settings, text=self.t("light"),
+        self.style(tk.Radiobutton(
+            settings,
             variable=theme_var, value="light",
-            command=lambda: self.change_theme("light"),
-            bg=self.colors['bg'], fg=self.colors['text']
-        ).pack()
+            command=lambda: self.change_theme("light")
+        ), text="light", bg='bg', fg='text', selectcolor='surface').pack()
+
+        precision_var = tk.StringVar(value=self.engine.precision.mode)
+        digits_var = tk.StringVar(value=str(self.engine.precision.digits))
+
+        def apply_precision(event=None):
+            self.change_precision(precision_var.get(), digits_var.get())
+
+        self.style(tk.Label(settings), text="precision", bg='bg', fg='text').pack()
+
+        for mode, label in (("float", "float"), ("decimal", "Decimal"), ("fraction", "Fraction")):
+            self.style(tk.Radiobutton(settings, text=label, variable=precision_var, value=mode,
+                                      command=apply_precision
+            ), bg='bg', fg='text', selectcolor='surface').pack()
+
+        self.style(tk.Label(settings), text="digits", bg='bg', fg='text').pack()
+
+        digits_box = self.style(tk.Spinbox(
+            settings,
+            from_=1, to=MAX_DIGITS,
+            textvariable=digits_var,
+            width=8,
+            command=apply_precision
+        ), bg='surface', fg='text')
+        digits_box.pack()
+        digits_box.bind('<Return>', apply_precision)
+        digits_box.bind('<FocusOut>', apply_precision)
+
+    def change_precision(self, mode, digits):
+        try:
+            self.engine.precision = Precision(mode, int(digits))
+        except ValueError:
+            messagebox.showwarning("Ошибка", f"Число знаков должно быть от 1 до {MAX_DIGITS}")
+            return
+        self.save_settings()
+        if self.current_operation:
+            self.update_expression()
 
     def create_header(self, parent):
-        header = tk.Frame(parent, bg=self.colors['bg'], height=80)
+        header = self.style(tk.Frame(parent, height=80), bg='bg')
         header.pack(fill='x', pady=(0, 10))
         header.pack_propagate(False)
 
-        title_frame = tk.Frame(header, bg=self.colors['bg'])
+        title_frame = self.style(tk.Frame(header), bg='bg')
         title_frame.pack(side='left', fill='y')
 
-        tk.Label(
+        self.style(tk.Label(
             title_frame,
             text="CALCULATOR",
-            font=self.font_title,
-            bg=self.colors['bg'],
-            fg=self.colors['text']
-        ).pack(side='left', padx=(10, 0))
+            font=self.font_title
+        ), bg='bg', fg='text').pack(side='left', padx=(10, 0))
 
-        tk.Label(
+        self.style(tk.Label(
             title_frame,
             text="NS",
-            font=self.font_title,
-            bg=self.colors['bg'],
-            fg=self.colors['primary']
-        ).pack(side='left')
+            font=self.font_title
+        ), bg='bg', fg='primary').pack(side='left')
 
-        tk.Label(
+        self.style(tk.Label(
             title_frame,
             text="v3.0",
-            font=self.font_subtitle,
-            bg=self.colors['bg'],
-            fg=self.colors['text_light']
-        ).pack(side='left', padx=(15, 0))
+            font=self.font_subtitle
+        ), bg='bg', fg='text_light').pack(side='left', padx=(15, 0))
 
-        controls = tk.Frame(header, bg=self.colors['bg'])
+        controls = self.style(tk.Frame(header), bg='bg')
         controls.pack(side='right', fill='y')
 
-        self.create_small_button(controls, "⟳ Сброс", self.reset_all, self.colors['surface'])
-        self.create_small_button(controls, "История", self.show_history_dialog, self.colors['surface'])
-        self.create_small_button(controls, "Настройки", self.open_settings, self.colors['surface'])
+        self.create_small_button(controls, "⟳ Сброс", self.reset_all, 'surface')
+        self.create_small_button(controls, "История", self.show_history_dialog, 'surface')
+        self.create_small_button(controls, "Диагностика", self.show_diagnostics_dialog, 'surface')
+        self.create_small_button(controls, "Настройки", self.open_settings, 'surface')
 
     def create_small_button(self, parent, text, command, bg):
-        btn = tk.Button(
+        btn = self.style(tk.Button(
             parent,
-            text=text,
             command=command,
-            bg=bg,
-            fg=self.colors['text'],
             font=self.font_subtitle,
             relief='flat',
             bd=0,
             padx=15,
             pady=8,
             cursor='hand2'
-        )
+        ), text=text, bg=bg, fg='text')
         btn.pack(side='left', padx=5)
         btn.bind("<Enter>", lambda e: btn.config(bg=self.colors['border']))
-        btn.bind("<Leave>", lambda e: btn.config(bg=bg))
+        btn.bind("<Leave>", lambda e: btn.config(bg=self.colors[bg]))
         return btn
 
     def create_left_panel(self, parent):
-        panel = tk.Frame(parent, bg=self.colors['surface'], relief='flat', bd=1)
+        panel = self.style(tk.Frame(parent, relief='flat', bd=1), bg='surface')
 
-        tk.Label(
+        self.style(tk.Label(
             panel,
-            text="ОПЕРАЦИИ",
             font=self.font_button,
-            bg=self.colors['surface'],
-            fg=self.colors['text_light'],
             anchor='w'
-        ).pack(fill='x', padx=20, pady=(20, 10))
+        ), text="ОПЕРАЦИИ", bg='surface', fg='text_light').pack(fill='x', padx=20, pady=(20, 10))
 
-        canvas = tk.Canvas(panel, bg=self.colors['surface'], highlightthickness=0)
+        canvas = self.style(tk.Canvas(panel, highlightthickness=0), bg='surface')
         scrollbar = ttk.Scrollbar(panel, orient="vertical", command=canvas.yview)
 
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['surface'])
+        scrollable_frame = self.style(tk.Frame(canvas), bg='surface')
 
         scrollable_frame.bind(
             "<Configure>",
@@ -336,54 +579,54 @@ class Calculator:
 
         categories = [
             ("#3b82f6", "АРИФМЕТИКА", [
-                ("Сложение", self.add, 2),
-                ("Вычитание", self.subtract, 2),
-                ("Умножение", self.multiply, 2),
-                ("Деление", self.divide, 2),
-                ("Степень", self.power, 2),
-                ("Корень числа", self.sqrt, 1)
+                ("Сложение", "add"),
+                ("Вычитание", "subtract"),
+                ("Умножение", "multiply"),
+                ("Деление", "divide"),
+                ("Степень", "power"),
+                ("Корень числа", "sqrt")
             ]),
             ("#8b5cf6", "ЧИСЛА", [
-                ("Факториал", self.factorial, 1),
-                ("Дв-й Факториал", self.double_fact, 1),
-                ("Простое?", self.is_prime, 1),
-                ("Множители", self.prime_factors, 1),
-                ("НОД", self.gcd, 2),
-                ("НОК", self.lcm, 2)
+                ("Факториал", "factorial"),
+                ("Дв-й Факториал", "double_fact"),
+                ("Простое?", "is_prime"),
+                ("Множители", "prime_factors"),
+                ("НОД", "gcd"),
+                ("НОК", "lcm")
             ]),
             ("#10b981", "ГЕОМЕТРИЯ", [
-                ("Синус", self.sin, 1),
-                ("Косинус", self.cos, 1),
-                ("Тангенс", self.tan, 1),
-                ("Котангенс", self.ctg, 1),
-                ("° → rad", self.deg_to_rad, 1),
-                ("rad → °", self.rad_to_deg, 1)
+                ("Синус", "sin"),
+                ("Косинус", "cos"),
+                ("Тангенс", "tan"),
+                ("Котангенс", "ctg"),
+                ("° → rad", "deg_to_rad"),
+                ("rad → °", "rad_to_deg")
             ]),
             ("#f59e0b", "АЛГЕБРА", [
-                ("Уравнение Х", self.solve_linear, 2),
-                ("Уравнение Х²", self.solve_quadratic, 3),
-                ("Логарифм", self.logarithm, 2),
-                ("Модуль", self.abs, 1),
-                ("Дробная Часть", self.fractional, 1),
-                ("Целая Часть", self.integer, 1)
+                ("Уравнение Х", "solve_linear"),
+                ("Уравнение Х²", "solve_quadratic"),
+                ("Логарифм", "logarithm"),
+                ("Модуль", "abs"),
+                ("Дробная Часть", "fractional"),
+                ("Целая Часть", "integer")
             ]),
 
             ("#ff0000", "ФУНКЦИИ", [
-                ("Прямая", self.line, 2),
-                ("Парабола", self.parabola, 3),
-                ("Гипербола", self.hyperbola, 3),
-                ("Косинусоида", self.cosinus, 2),
-                ("Синусоида", self.sinus, 2),
-                ("Тангенсоида", self.tang, 2)
+                ("Прямая", "line"),
+                ("Парабола", "parabola"),
+                ("Гипербола", "hyperbola"),
+                ("Косинусоида", "cosinus"),
+                ("Синусоида", "sinus"),
+                ("Тангенсоида", "tang")
             ]),
 
             ("#ff69b4", "ГРАФИКИ", [
-                ("Окружность", self.circle, 3),
-                ("Модуль Х", self.moduleX, 2),
-                ("Модуль Y", self.moduleY, 2),
-                ("Модуль Y и Х", self.moduleXY, 2),
-                ("Котангенсоида", self.cotang, 2),
-                ("Сердце", self.heart, 1)
+                ("Окружность", "circle"),
+                ("Модуль Х", "moduleX"),
+                ("Модуль Y", "moduleY"),
+                ("Модуль Y и Х", "moduleXY"),
+                ("Котангенсоида", "cotang"),
+                ("Сердце", "heart")
             ])
         ]
 
@@ -398,38 +641,33 @@ class Calculator:
         return panel
 
     def create_category(self, parent, color, title, functions):
-        frame = tk.Frame(parent, bg=self.colors['surface'])
+        frame = self.style(tk.Frame(parent), bg='surface')
         frame.pack(fill='x', padx=10, pady=(0, 7.5))
 
-        tk.Label(
+        self.style(tk.Label(
             frame,
-            text=title,
             font=self.font_button,
-            bg=self.colors['surface'],
             fg=color,
             anchor='w'
-        ).pack(fill='x', pady=(0, 1))
+        ), text=title, bg='surface').pack(fill='x', pady=(0, 1))
 
-        buttons_frame = tk.Frame(frame, bg=self.colors['surface'])
+        buttons_frame = self.style(tk.Frame(frame), bg='surface')
         buttons_frame.pack(fill='x')
 
         for i in range(3):
             buttons_frame.grid_columnconfigure(i, weight=1, uniform="group1")
 
-        for i, (text, func, args) in enumerate(functions):
-            btn = tk.Button(
+        for i, (text, name) in enumerate(functions):
+            btn = self.style(tk.Button(
                 buttons_frame,
-                text=text,
-                command=lambda f=func, a=args: self.select_operation(f, a),
-                bg=self.colors['card'],
-                fg=self.colors['text'],
+                command=lambda n=name: self.select_operation(n),
                 font=self.font_button,
                 relief='flat',
                 bd=1,
                 padx=5,
                 pady=5,
                 cursor='hand2',
-            )
+            ), text=text, bg='card', fg='text')
 
             btn.grid(row=i // 3, column=i % 3, padx=3, pady=3, sticky='ew')
 
@@ -443,113 +681,127 @@ class Calculator:
             buttons_frame.grid_columnconfigure(i, weight=1)
 
     def create_right_panel(self, parent):
-        panel = tk.Frame(parent, bg=self.colors['surface'])
+        panel = self.style(tk.Frame(parent), bg='surface')
 
         self.create_input_section(panel)
         self.create_output_section(panel)
 
+        self.plot_container = self.style(tk.Frame(panel), bg='surface')
+        self.plot_container.pack(fill='both', expand=True)
+
         return panel
 
     def create_input_section(self, parent):
-        frame = tk.Frame(parent, bg=self.colors['surface'])
+        frame = self.style(tk.Frame(parent), bg='surface')
         frame.pack(fill='x', pady=(0, 20))
 
-        tk.Label(
-            frame,
-            text="ВВОД",
+        title = self.style(tk.Frame(frame), bg='surface')
+        title.pack(fill='x', padx=20, pady=(0, 10))
+
+        self.style(tk.Label(
+            title,
             font=self.font_button,
-            bg=self.colors['surface'],
-            fg=self.colors['text_light'],
             anchor='w'
-        ).pack(fill='x', padx=20, pady=(0, 10))
+        ), text="ВВОД", bg='surface', fg='text_light').pack(side='left')
+
+        self.style(tk.Checkbutton(
+            title,
+            variable=self.live_var,
+            command=self.update_live,
+            font=self.font_subtitle,
+            cursor='hand2'
+        ), text="Живой режим", bg='surface', fg='text_light', selectcolor='card',
+            activebackground='surface').pack(side='right')
 
-        input_card = tk.Frame(frame, bg=self.colors['card'], relief='flat', bd=1)
+        input_card = self.style(tk.Frame(frame, relief='flat', bd=1), bg='card')
         input_card.pack(fill='x', padx=20)
 
-        self.expression_display = tk.Label(
+        self.expression_display = self.style(tk.Label(
             input_card,
             textvariable=self.expression_var,
             font=self.font_input,
-            bg=self.colors['card'],
-            fg=self.colors['text_light'],
             anchor='w',
             height=2
-        )
+        ), bg='card', fg='text_light')
         self.expression_display.pack(fill='x', padx=15, pady=5)
 
-        self.input_container = tk.Frame(input_card, bg=self.colors['card'])
+        self.input_container = self.style(tk.Frame(input_card), bg='card')
         self.input_container.pack(fill='x', padx=15, pady=(0, 15))
 
-        self.status_label = tk.Label(
+        self.status_label = self.style(tk.Label(
             input_card,
-            text="Строки для ввода переменных",
             font=self.font_subtitle,
-            bg=self.colors['card'],
-            fg=self.colors['text_light'],
             anchor='w'
-        )
+        ), text="Строки для ввода переменных", bg='card', fg='text_light')
         self.status_label.pack(fill='x', padx=15, pady=(0, 10))
 
     def create_output_section(self, parent):
-        frame = tk.Frame(parent, bg=self.colors['surface'])
+        frame = self.style(tk.Frame(parent), bg='surface')
         frame.pack(fill='both', expand=True)
 
-        tk.Label(
+        self.style(tk.Label(
             frame,
-            text="РЕЗУЛЬТАТ",
             font=self.font_button,
-            bg=self.colors['surface'],
-            fg=self.colors['text_light'],
             anchor='w'
-        ).pack(fill='x', padx=20, pady=(0, 10))
+        ), text="РЕЗУЛЬТАТ", bg='surface', fg='text_light').pack(fill='x', padx=20, pady=(0, 10))
 
-        output_card = tk.Frame(frame, bg=self.colors['card'], relief='flat', bd=1)
+        output_card = self.style(tk.Frame(frame, relief='flat', bd=1), bg='card')
         output_card.pack(fill='both', expand=True, padx=20)
 
-        result_display = tk.Label(
+        result_display = self.style(tk.Label(
             output_card,
             textvariable=self.result_var,
             font=self.font_result,
-            bg=self.colors['card'],
-            fg=self.colors['accent'],
             anchor='w',
             justify='left',
             wraplength=400
-        )
+        ), bg='card', fg='accent')
         result_display.pack(fill='both', expand=True, padx=20, pady=20)
 
-        controls = tk.Frame(output_card, bg=self.colors['card'])
+        controls = self.style(tk.Frame(output_card), bg='card')
         controls.pack(fill='x', padx=20, pady=(0, 20))
 
-        tk.Button(
+        self.style(tk.Button(
             controls,
-            text="Вычислить",
             command=self.calculate,
-            bg=self.colors['primary'],
             fg='white',
             font=self.font_button,
             relief='flat',
             padx=30,
             pady=12,
             cursor='hand2'
-        ).pack(side='left')
+        ), text="Вычислить", bg='primary').pack(side='left')
 
-        tk.Button(
+        self.style(tk.Button(
             controls,
-            text="Копировать",
             command=self.copy_result,
-            bg=self.colors['surface'],
-            fg=self.colors['text'],
             font=self.font_button,
             relief='flat',
             padx=20,
             pady=12,
             cursor='hand2'
-        ).pack(side='left', padx=(10, 0))
+        ), text="Копировать", bg='surface', fg='text').pack(side='left', padx=(10, 0))
 
-    def select_operation(self, func, num_args):
-        self.current_function = func
-        self.num_args = num_args
+        self.cancel_button = self.style(tk.Button(
+            controls,
+            command=self.cancel_calculation,
+            fg='white',
+            font=self.font_button,
+            relief='flat',
+            padx=20,
+            pady=12,
+            cursor='hand2',
+            state='disabled'
+        ), text="Отмена", bg='danger')
+        self.cancel_button.pack(side='left', padx=(10, 0))
+
+    def select_operation(self, name):
+        self.current_operation = self.engine.get(name)
+        self.view = None
+        num_args = self.current_operation.arity
+        if self.current_operation.variadic:
+            # В окне НОД и НОК по-прежнему от двух чисел; больше - через выражение или пакетный режим
+            num_args = max(num_args, 2)
 
         for widget in self.input_container.winfo_children():
             widget.destroy()
@@ -558,29 +810,24 @@ class Calculator:
         self.expression_var.set("")
 
         for i in range(num_args):
-            field_frame = tk.Frame(self.input_container, bg=self.colors['card'])
+            field_frame = self.style(tk.Frame(self.input_container), bg='card')
             field_frame.pack(fill='x', pady=3)
 
             label_text = ["a:", "b:", "c:", "x:", "y:"][i] if i < 5 else f"arg{i + 1}:"
 
-            tk.Label(
+            self.style(tk.Label(
                 field_frame,
                 text=label_text,
-                bg=self.colors['card'],
-                fg=self.colors['text_light'],
                 font=self.font_input,
                 width=4
-            ).pack(side='left')
+            ), bg='card', fg='text_light').pack(side='left')
 
-            entry = tk.Entry(
+            entry = self.style(tk.Entry(
                 field_frame,
                 font=self.font_input,
-                bg=self.colors['surface'],
-                fg=self.colors['text'],
-                insertbackground=self.colors['text'],
                 relief='flat',
                 bd=1
-            )
+            ), bg='surface', fg='text', insertbackground='text')
             entry.pack(side='left', fill='x', expand=True, padx=(10, 0))
 
             self.input_fields.append(entry)
@@ -588,18 +835,98 @@ class Calculator:
             entry.bind('<Return>', lambda e: self.calculate())
             entry.bind('<KeyRelease>', self.update_expression)
 
+        self.update_live()
+
+    def update_live(self):
+        # Ползунки только у графиков: у них нет вычисляемого значения, только перерисовка
+        for slider in self.live_sliders:
+            slider.destroy()
+        self.live_sliders = []
+        self.live_vars = []
+        if self.live_job is not None:
+            self.root.after_cancel(self.live_job)
+            self.live_job = None
+
+        operation = self.current_operation
+        if not self.live_var.get() or operation is None or operation.pure:
+            return
+
+        for entry in self.input_fields:
+            text = entry.get().strip()
+            try:
+                value = 1.0 if self.engine.has_calls(text) else float(self.engine.evaluate_expression(text, INTERACTIVE_BITS))
+            except Exception:
+                value = 1.0
+            limit = max(SLIDER_RANGE, math.ceil(abs(value)))
+            var = tk.DoubleVar(value=value)
+            slider = self.style(tk.Scale(
+                entry.master,
+                variable=var,
+                from_=-limit, to=limit,
+                resolution=0.1,
+                orient='horizontal',
+                showvalue=False,
+                length=160,
+                highlightthickness=0,
+                bd=0
+            ), bg='card', troughcolor='surface', activebackground='primary')
+            slider.pack(side='right', padx=(10, 0))
+            var.trace_add('write', lambda *args, e=entry, v=var: self.on_live_change(e, v))
+            self.live_sliders.append(slider)
+            self.live_vars.append(var)
+
+        self.live_dirty = True
+        self.render_live()
+
+    def on_live_change(self, entry, var):
+        value = self.live_value(var)
+        entry.delete(0, 'end')
+        entry.insert(0, str(value))
+
+        # Кадр рисуется по последним значениям; события, пришедшие во время отрисовки, сливаются в один
+        self.live_dirty = True
+        if self.live_job is None:
+            wait = FRAME_INTERVAL - (time.perf_counter() - self.live_rendered) * 1000
+            self.live_job = self.root.after(max(0, int(wait)), self.render_live)
+
+    def live_value(self, var):
+        value = round(var.get(), 1)
+        return int(value) if value.is_integer() else value
+
+    def render_live(self):
+        self.live_job = None
+        if not self.live_dirty or self.current_operation is None:
+            return
+        self.live_dirty = False
+
+        self.live_rendered = time.perf_counter()
+        values = [self.live_value(var) for var in self.live_vars]
+        self.graph = (self.current_operation.name, values)
+        try:
+            self.result_var.set(self.engine.evaluate(self.current_operation.name, *values))
+        except Exception as e:
+            self.show_error(e)
+        self.update_expression()
+
     def update_expression(self, event=None):
         values = []
         for entry in self.input_fields:
             val = entry.get().strip()
             if val:
                 try:
-                    float(val)
-                    values.append(val)
-                except:
+                    # Предпросмотр идёт на каждое нажатие клавиши: вызовы операций в нём не выполняем
+                    if self.engine.has_calls(val):
+                        values.append(val)
+                        continue
+                    value = self.engine.evaluate_expression(val, INTERACTIVE_BITS)
+                    if isinstance(value, float):
+                        value = f"{value:.10g}"
+                    value = str(value)
+                    values.append(val if value == val else f"{val} = {value}")
+                except Exception:
                     values.append(val)
 
-        func_name = self.current_function.__name__.replace('_', ' ').title() if self.current_function else ""
+        func_name = self.current_operation.name.replace('_', ' ').title() if self.current_operation else ""
 
         if values:
             args_str = ', '.join(values)
@@ -608,181 +935,386 @@ class Calculator:
             self.expression_var.set(func_name)
 
     def calculate(self):
-        if not self.current_function:
+        if not self.current_operation:
             messagebox.showinfo("Внимание", "Сначала выберите операцию")
             return
+        if self.job is not None:
+            return
 
         try:
-            args = []
-            for entry in self.input_fields:
-                val = entry.get().strip()
-                if not val:
-                    messagebox.showwarning("Ошибка", "Заполните все поля")
-                    return
-
-                try:
-                    if '/' in val and val.count('/') == 1:
-                        num, den = val.split('/')
-                        args.append(float(num) / float(den))
-                    elif val.lower() == 'pi':
-                        args.append(math.pi)
-                    elif val.lower() == 'e':
-                        args.append(math.e)
-                    else:
-                        args.append(float(val))
-                except:
-                    args.append(val)
-
-            result = self.current_function(*args)
-
-            if isinstance(result, float):
-                if abs(result) > 1e10 or (abs(result) < 1e-10 and result != 0):
-                    result = f"{result:.4e}"
-                elif result.is_integer():
-                    result = int(result)
+            values = [entry.get().strip() for entry in self.input_fields]
+            if not all(values):
+                messagebox.showwarning("Ошибка", "Заполните все поля")
+                return
+
+            operation = self.current_operation
+            texts = [entry.get() for entry in self.input_fields]
+
+            if any(self.engine.has_calls(val) for val in values):
+                # Вызов операции в поле может считаться так же долго, как сама операция
+                self.submit_calculation(operation, values, texts, expressions=True)
+                return
+
+            try:
+                args = [self.engine.evaluate_expression(val, INTERACTIVE_BITS) for val in values]
+            except NumberTooLarge:
+                # Огромные числа в полях тоже считаются в процессе вычисления, уже с обычным пределом
+                self.submit_calculation(operation, values, texts, expressions=True)
+                return
+            key = self.engine.cache_key(operation.name, args) if operation.pure else None
+            started = time.perf_counter()
+            result = self.engine.cache.get(key) if key is not None else None
+            if result is not None:
+                # Попадание в кэш - тоже вызов: без него перцентили смещены к холодным вызовам
+                self.engine.metrics.record(operation.name, time.perf_counter() - started, result=result)
+
+            if result is None:
+                from calc_parallel import estimate
+
+                if not operation.pure:
+                    self.graph = (operation.name, args)
+                    result = self.engine.evaluate(operation.name, *args)
+                elif not self.engine.precision.exact and estimate(operation.name, args) < INLINE_COST:
+                    # Пересылка в процесс и опрос стоили бы дороже самого вычисления.
+                    # В точных режимах даже простая операция может считаться долго: там всё уходит в процесс
+                    result = self.engine.evaluate(operation.name, *args)
                 else:
-                    result = round(result, 10)
+                    self.submit_calculation(operation, args, texts, key)
+                    return
 
-            self.result_var.set(f"{result}")
-            self.add_to_history(result)
+            self.show_result(result, operation.name, texts)
 
-        except ZeroDivisionError:
-            self.result_var.set("ERROR: Деление на ноль")
-        except ValueError as e:
-            self.result_var.set(f"ERROR: {str(e)}")
         except Exception as e:
-            self.result_var.set(f"ERROR: Ошибка вычисления")
+            self.show_error(e)
+
+    def submit_calculation(self, operation, args, texts, key=None, expressions=False):
+        # Чистые операции считаются в отдельном процессе, окно при этом не замирает.
+        # Графики рисует окно, поэтому для них в процессе вычисляются только поля
+        name = operation.name if operation.pure else None
+        self.worker.submit(name, tuple(args), precision=self.engine.precision, expressions=expressions)
+        self.job = (operation.name, texts, key, name is None)
+        self.cancel_button.configure(state='normal')
+        self.poll_calculation(FIRST_POLL_WAIT)
+
+    def poll_calculation(self, wait=0):
+        self.poll_id = None
+        if self.job is None:
+            return
 
-    def add_to_history(self, result):
-        if self.current_function:
-            func_name = self.current_function.__name__
-            args = [entry.get() for entry in self.input_fields]
+        reply = self.worker.poll(wait)
+        if reply is None:
+            elapsed = self.worker.elapsed()
+            frame = SPINNER[int(elapsed * 1000 / POLL_INTERVAL) % len(SPINNER)]
+            self.result_var.set(f"{frame} {self.t('Вычисление...')} {elapsed:.1f} с")
+            self.poll_id = self.root.after(POLL_INTERVAL, self.poll_calculation)
+            return
 
-            entry = {
-                'function': func_name,
-                'args': args,
-                'result': str(result)
-            }
+        name, texts, key, arguments = self.job
+        self.finish_calculation()
+        success, value, wall, cpu = reply
+        if not success:
+            if not arguments:
+                self.engine.metrics.record(name, wall, cpu, error=value)
+            self.show_error(value)
+        elif arguments:
+            try:
+                self.graph = (name, list(value))
+                self.show_result(self.engine.evaluate(name, *value), name, texts)
+            except Exception as e:
+                self.show_error(e)
+        else:
+            self.engine.metrics.record(name, wall, cpu, value)
+            if key is not None:
+                self.engine.cache.put(key, value)
+            try:
+                self.show_result(value, name, texts)
+            except Exception as e:
+                self.show_error(e)
+
+    def finish_calculation(self):
+        self.job = None
+        if self.poll_id is not None:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.cancel_button.configure(state='disabled')
+
+    def cancel_calculation(self):
+        if self.job is None:
+            return
+        self.worker.cancel()
+        self.finish_calculation()
+        self.result_var.set(self.t("Вычисление отменено"))
+
+    def show_result(self, result, name, texts):
+        if isinstance(result, float):
+            if abs(result) > 1e10 or (abs(result) < 1e-10 and result != 0):
+                result = f"{result:.4e}"
+            elif result.is_integer():
+                result = int(result)
+            else:
+                result = round(result, 10)
+        elif isinstance(result, int) and result.bit_length() > 3000:
+            result = describe(result)
+        elif isinstance(result, Fraction):
+            numerator, denominator = result.numerator, result.denominator
+            if max(numerator.bit_length(), denominator.bit_length()) > 3000:
+                # str() для int длиннее 4300 цифр запрещён, а float такую дробь не вмещает
+                approximate = Context(prec=10).divide(Decimal(numerator), Decimal(denominator))
+                result = f"{describe(numerator)} / {describe(denominator)} ≈ {approximate}"
+            else:
+                try:
+                    result = f"{result} ≈ {float(result):.10g}"
+                except OverflowError:
+                    result = str(result)
 
-            self.history.append(entry)
-            if len(self.history) > 50:
-                self.history.pop(0)
+        self.result_var.set(f"{result}")
+        self.add_to_history(result, name, texts)
 
-            self.save_history()
+    def show_error(self, error):
+        if isinstance(error, ZeroDivisionError):
+            self.result_var.set("ERROR: Деление на ноль")
+        elif isinstance(error, OverflowError):
+            self.result_var.set("ERROR: Переполнение: результат слишком велик для float")
+        elif isinstance(error, InvalidOperation):
+            # str() у исключений decimal - только список сигналов
+            self.result_var.set("ERROR: Результат не определён (например, корень из отрицательного числа)")
+        elif isinstance(error, DecimalOverflow):
+            self.result_var.set("ERROR: Переполнение: результат вне диапазона Decimal")
+        elif isinstance(error, (ValueError, TimeoutError)):
+            self.result_var.set(f"ERROR: {str(error)}")
+        else:
+            # Неожиданные ошибки показываем с типом, чтобы их можно было отличить друг от друга
+            self.result_var.set(f"ERROR: {type(error).__name__}: {error}")
+
+    def add_to_history(self, result, func_name, args):
+        entry = {
+            'function': func_name,
+            'args': args,
+            'result': str(result)
+        }
 
-    def save_history(self):
-        try:
-            with open('calc_history.json', 'w', encoding='utf-8') as f:
-                json.dump(self.history[-20:], f, ensure_ascii=False, indent=2)
-        except:
-            pass
+        self.history_store.append(entry)
 
     def load_history(self):
-        try:
-            if os.path.exists('calc_history.json'):
-                with open('calc_history.json', 'r', encoding='utf-8') as f:
-                    self.history = json.load(f)
-        except:
-            self.history = []
+        self.history_store = HistoryStore(retention=self.history_retention)
+
+    def on_close(self):
+        self.worker.stop()
+        self.history_store.close()
+        self.engine.cache.save()
+        self.root.destroy()
 
     def show_history_dialog(self):
-        dialog = tk.Toplevel(self.root)
+        dialog = self.style(tk.Toplevel(self.root), bg='bg')
         dialog.title("История вычислений")
         dialog.geometry("600x500")
-        dialog.configure(bg=self.colors['bg'])
         dialog.transient(self.root)
 
-        header = tk.Frame(dialog, bg=self.colors['surface'], height=60)
+        header = self.style(tk.Frame(dialog, height=60), bg='surface')
         header.pack(fill='x')
         header.pack_propagate(False)
 
-        tk.Label(
+        self.style(tk.Label(
             header,
-            text="ИСТОРИЯ",
-            font=self.font_title,
-            bg=self.colors['surface'],
-            fg=self.colors['text']
-        ).pack(side='left', padx=20)
+            font=self.font_title
+        ), text="ИСТОРИЯ", bg='surface', fg='text').pack(side='left', padx=20)
 
-        tk.Button(
+        self.style(tk.Button(
             header,
-            text="Очистить",
             command=lambda: self.clear_history(dialog),
-            bg=self.colors['danger'],
             fg='white',
             font=self.font_button,
             relief='flat'
-        ).pack(side='right', padx=20)
+        ), text="Очистить", bg='danger').pack(side='right', padx=20)
 
-        canvas = tk.Canvas(dialog, bg=self.colors['bg'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(dialog, orient='vertical', command=canvas.yview)
-        scroll_frame = tk.Frame(canvas, bg=self.colors['bg'])
+        filters = self.style(tk.Frame(dialog), bg='bg')
+        filters.pack(fill='x', padx=20, pady=(15, 0))
 
-        scroll_frame.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
+        query_var = tk.StringVar()
+        self.style(tk.Entry(
+            filters,
+            textvariable=query_var,
+            font=self.font_input,
+            relief='flat',
+            bd=1
+        ), bg='surface', fg='text', insertbackground='text').pack(side='left', fill='x', expand=True)
+
+        function_var = tk.StringVar(value="Все")
+        function_box = ttk.Combobox(
+            filters,
+            textvariable=function_var,
+            values=["Все"] + self.history_store.functions(),
+            state='readonly',
+            width=15
+        )
+        function_box.pack(side='right', padx=(10, 0))
 
-        canvas.create_window((0, 0), window=scroll_frame, anchor='nw')
-        canvas.configure(yscrollcommand=scrollbar.set)
+        def selected_function():
+            function = function_var.get()
+            return None if function == "Все" else function
 
-        canvas.pack(side='left', fill='both', expand=True, padx=20, pady=20)
-        scrollbar.pack(side='right', fill='y')
-
-        if not self.history:
-            tk.Label(
-                scroll_frame,
-                text="История пуста",
-                font=self.font_subtitle,
-                bg=self.colors['bg'],
-                fg=self.colors['text_light']
-            ).pack(pady=50)
-        else:
-            for i, entry in enumerate(reversed(self.history)):
-                self.create_history_item(scroll_frame, entry, i)
+        def fetch(start, count):
+            return self.history_store.page(start, count, query_var.get(), selected_function())
 
-    def create_history_item(self, parent, entry, index):
-        frame = tk.Frame(parent, bg=self.colors['card'], relief='flat', bd=1)
-        frame.pack(fill='x', pady=5)
+        row_height = self.font_input.metrics('linespace') + self.font_result.metrics('linespace') + 30
+        history_list = VirtualList(
+            dialog, row_height, fetch, self.create_history_item, self.fill_history_item, self.colors['bg']
+        )
+        self.style(history_list, bg='bg')
+        self.style(history_list.body, bg='bg')
+        history_list.pack(fill='both', expand=True, padx=20, pady=20)
+
+        empty_label = self.style(tk.Label(
+            history_list.body,
+            font=self.font_subtitle
+        ), bg='bg', fg='text_light')
+
+        def apply_filter():
+            total = len(self.history_store.search(query_var.get(), selected_function()))
+            history_list.reset(total)
+            if total:
+                empty_label.place_forget()
+            else:
+                self.style(empty_label, text="Ничего не найдено" if query_var.get() or selected_function() else "История пуста",
+                           bg='bg', fg='text_light')
+                empty_label.place(relx=0.5, y=50, anchor='n')
 
-        func_name = entry['function'].replace('_', ' ').title()
-        args_str = ', '.join(entry['args'])
+        pending = []
+
+        def schedule_filter(*args):
+            while pending:
+                dialog.after_cancel(pending.pop())
+            pending.append(dialog.after(150, apply_filter))
+
+        query_var.trace_add('write', schedule_filter)
+        function_box.bind('<<ComboboxSelected>>', lambda e: apply_filter())
+
+        apply_filter()
+
+    def show_diagnostics_dialog(self):
+        dialog = self.style(tk.Toplevel(self.root), bg='bg')
+        dialog.title(self.t("Диагностика"))
+        dialog.geometry("760x500")
+        dialog.transient(self.root)
+
+        header = self.style(tk.Frame(dialog, height=60), bg='surface')
+        header.pack(fill='x')
+        header.pack_propagate(False)
 
-        expr_label = tk.Label(
+        self.style(tk.Label(
+            header,
+            font=self.font_title
+        ), text="ДИАГНОСТИКА", bg='surface', fg='text').pack(side='left', padx=20)
+
+        self.style(tk.Button(
+            header,
+            command=lambda: (self.engine.metrics.clear(), redraw()),
+            fg='white',
+            font=self.font_button,
+            relief='flat'
+        ), text="Сбросить", bg='danger').pack(side='right', padx=(0, 20))
+
+        self.style(tk.Button(
+            header,
+            command=lambda: self.export_metrics(dialog),
+            fg='white',
+            font=self.font_button,
+            relief='flat'
+        ), text="Экспорт", bg='primary').pack(side='right', padx=10)
+
+        columns = ["count", "errors"] + [f"p{q}" for q in PERCENTILES] + ["cpu", "size"]
+        table = ttk.Treeview(dialog, columns=columns, show='tree headings')
+        table.heading('#0', text=self.t("Операция"))
+        table.column('#0', width=140)
+        for column, title in zip(columns, ["Вызовов", "Ошибок"] + [f"p{q}" for q in PERCENTILES] + ["CPU p95", "Размер p95"]):
+            table.heading(column, text=self.t(title))
+            table.column(column, width=85, anchor='e')
+        table.pack(fill='both', expand=True, padx=20, pady=20)
+
+        def redraw():
+            table.delete(*table.get_children())
+            summary = self.engine.metrics.summary()
+            if not summary:
+                table.insert('', 'end', text=self.t("Нет данных"))
+            for name, stats in summary.items():
+                errors = ', '.join(f"{kind}: {count}" for kind, count in stats['errors'].items())
+                table.insert('', 'end', text=name, values=(
+                    stats['count'],
+                    errors or 0,
+                    *(format_duration(stats['wall'][f"p{q}"]) for q in PERCENTILES),
+                    format_duration(stats['cpu']['p95']),
+                    format_size(stats['size']['p95'])
+                ))
+
+        def refresh():
+            if not table.winfo_exists():
+                return
+            redraw()
+            dialog.after(DIAGNOSTICS_INTERVAL, refresh)
+
+        refresh()
+
+    def export_metrics(self, parent):
+        path = filedialog.asksaveasfilename(
+            parent=parent,
+            defaultextension='.json',
+            initialfile='calc_metrics.json',
+            filetypes=[("JSON", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            self.engine.metrics.export(path)
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {e}", parent=parent)
+
+    def create_history_item(self, parent):
+        frame = self.style(tk.Frame(parent, relief='flat', bd=1), bg='card')
+
+        frame.expr_label = self.style(tk.Label(
             frame,
-            text=f"{func_name}({args_str})",
             font=self.font_input,
-            bg=self.colors['card'],
-            fg=self.colors['text']
-        )
-        expr_label.pack(anchor='w', padx=15, pady=(10, 0))
+            anchor='w'
+        ), bg='card', fg='text')
+        frame.expr_label.pack(fill='x', padx=15, pady=(10, 0))
 
-        result_label = tk.Label(
+        frame.result_label = self.style(tk.Label(
             frame,
-            text=f"= {entry['result']}",
             font=self.font_result,
-            bg=self.colors['card'],
-            fg=self.colors['accent']
-        )
-        result_label.pack(anchor='w', padx=15, pady=(5, 10))
+            anchor='w'
+        ), bg='card', fg='accent')
+        frame.result_label.pack(fill='x', padx=15, pady=(5, 10))
+
+        return frame
+
+    def fill_history_item(self, frame, entry):
+        func_name = entry['function'].replace('_', ' ').title()
+        args_str = ', '.join(entry['args'])
+
+        frame.expr_label.config(text=f"{func_name}({args_str})")
+        frame.result_label.config(text=f"= {entry['result']}")
 
     def clear_history(self, dialog=None):
-        self.history = []
-        self.save_history()
+        self.history_store.clear()
         if dialog:
             dialog.destroy()
             self.show_history_dialog()
 
     def copy_result(self):
         result = self.result_var.get()
-        if result and result != "ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ":
+        if result and result != self.t("ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ"):
             self.root.clipboard_clear()
 
-            self.result_var.set("Скопировано!")
+            self.result_var.set(self.t("Скопировано!"))
             self.root.after(1000, lambda: self.result_var.set(result))
 
     def reset_all(self):
-        self.current_function = None
+        self.cancel_calculation()
+        self.current_operation = None
+        self.view = None
         self.expression_var.set("")
-        self.result_var.set("ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ")
-        self.status_label.config(text="Строки для ввода переменных")
+        self.result_var.set(self.t("ВЫБЕРИТЕ ОПЕРАЦИЮ И ЗАПОЛНИТЕ СТРОКИ"))
+        self.style(self.status_label, text="Строки для ввода переменных", bg='card', fg='text_light')
 
         for widget in self.input_container.winfo_children():
             widget.destroy()
@@ -792,6 +1324,36 @@ class Calculator:
         self.root.bind('<Escape>', lambda e: self.reset_all())
         self.root.bind('<Control-c>', lambda e: self.copy_result())
         self.root.bind('<Control-l>', lambda e: self.show_history_dialog())
+        self.root.bind('<Control-d>', lambda e: self.show_diagnostics_dialog())
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_shown(self):
+        self.timings["shown"] = time.perf_counter() - STARTUP
+        if "--timings" in sys.argv:
+            self.print_timings()
+
+        # Процесс для вычислений запускаем заранее, чтобы первое нажатие не ждало его старта
+        self.worker.start()
+
+        # Тяжёлые модули графиков грузим в фоне, когда окно уже на экране
+        threading.Thread(target=self.warm_up, name='plot-warm-up', daemon=True).start()
+
+    def warm_up(self):
+        started = time.perf_counter()
+        try:
+            import numpy
+            import calc_implicit
+            import calc_sampling
+            import calc_plot
+        except ImportError:
+            return
+        self.timings["warm_up"] = time.perf_counter() - started
+        if "--timings" in sys.argv:
+            print(f"warm_up: {self.timings['warm_up'] * 1000:.1f} ms")
+
+    def print_timings(self):
+        for name in ("import", "fonts", "layout", "history", "shown"):
+            print(f"{name}: {self.timings[name] * 1000:.1f} ms")
 
     def center_window(self):
         self.root.update_idletasks()
@@ -803,201 +1365,10 @@ class Calculator:
         y = (screen_height - height) // 2
         self.root.geometry(f'{width}x{height}+{x}+{y}')
 
-    def add(self, a, b):
-        return a + b
-
-    def subtract(self, a, b):
-        return a - b
-
-    def multiply(self, a, b):
-        return a * b
-
-    def divide(self, a, b):
-        if b == 0:
-            raise ZeroDivisionError("Деление на ноль")
-        return a / b
-
-    def power(self, a, b):
-        return a ** b
-
-    def sqrt(self, x):
-        if x < 0:
-            raise ValueError("Корень из отрицательного числа")
-        return math.sqrt(x)
-
-    def factorial(self, n):
-        if n < 0:
-            raise ValueError("Факториал отрицательного числа")
-        if n > 100:
-            return math.inf
-        return math.factorial(int(n))
-
-    def double_fact(self, n):
-        n = int(n)
-        if n < 0:
-            raise ValueError("Отрицательное число")
-        result = 1
-        start = 2 if n % 2 == 0 else 1
-        for i in range(start, n + 1, 2):
-            result *= i
-        return result
-
-    def is_prime(self, n):
-        n = int(n)
-        if n < 1:
-            return "Функция работает только на натуральных числах!"
-        if n == 1:
-            return "Единица"
-        if n == 2:
-            return "Простое"
-        if n % 2 == 0:
-            return "Составное"
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return "Составное"
-        return "Простое"
-
-    def prime_factors(self, n):
-        n = int(n)
-        if n == 0:
-            return "0"
-        if n == 1:
-            return "1"
-
-        result = []
-        temp = abs(n)
-
-        while temp % 2 == 0:
-            result.append(2)
-            temp //= 2
-
-        i = 3
-        while i * i <= temp:
-            while temp % i == 0:
-                result.append(i)
-                temp //= i
-            i += 2
-
-        if temp > 1:
-            result.append(temp)
-
-        if n < 0:
-            result.insert(0, -1)
-
-        return ' × '.join(map(str, result))
-
-    def gcd(self, a, b):
-        a, b = int(a), int(b)
-        while b:
-            a, b = b, a % b
-        return abs(a)
-
-    def lcm(self, a, b):
-        a, b = int(a), int(b)
-        if a == 0 or b == 0:
-            return 0
-        return abs(a * b) // self.gcd(a, b)
-
-    def sin(self, a):
-        return math.sin(math.radians(a))
-
-    def cos(self, a):
-        return math.cos(math.radians(a))
-
-    def tan(self, a):
-        if a - 90 % 180 == 0:
-            raise ZeroDivisionError("Деление на ноль")
-
-        if a % 180 == 0:
-            return 0
-        else:
-            return math.tan(math.radians(a))
-
-    def ctg(self, a):
-        if a % 180 == 0:
-            raise ZeroDivisionError("Деление на ноль")
-        if a - 90 % 180 == 0:
-            return 0
-        else:
-            return 1 / math.tan(math.radians(a))
-
-    def deg_to_rad(self, deg):
-        return math.radians(deg)
-
-    def rad_to_deg(self, rad):
-        return math.degrees(rad)
-
-    def solve_linear(self, a, b):
-        if a == 0:
-            if b == 0:
-                return "Бесконечно решений"
-            return "Нет решений"
-        return -b / a
-
-    def solve_quadratic(self, a, b, c):
-        if a == 0:
-            return self.solve_linear(b, c)
-
-        D = b ** 2 - 4 * a * c
-        if D > 0:
-            x1 = (-b + math.sqrt(D)) / (2 * a)
-            x2 = (-b - math.sqrt(D)) / (2 * a)
-            return f"x₁ = {x1}, x₂ = {x2}"
-        elif D == 0:
-            x = -b / (2 * a)
-            return f"x = {x} (кратный)"
-        else:
-            real = -b / (2 * a)
-            imag = math.sqrt(-D) / (2 * a)
-            return f"x₁ = {real} + {imag}i, x₂ = {real} - {imag}i"
-
-    def logarithm(self, base, a):
-        if base <= 0 or base == 1:
-            raise ValueError("Основание должно быть >0 и ≠1")
-        if a <= 0:
-            raise ValueError("Аргумент должен быть >0")
-        return math.log(a, base)
-
-    def abs(self, a):
-        return abs(a)
-
-    def integer(self, x):
-        if x >= 0:
-            return int(x)
-        else:
-            if x - int(x) < 0:
-                return int(x) - 1
-
-            else:
-                return int(x)
-
-    def fractional(self, x):
-        if x >= 0:
-            return x - int(x)
-        else:
-            if x - int(x) < 0:
-                return x - (int(x) - 1)
-
-            else:
-                return 0
-
     def line(self, a, b):
-        x = np.linspace(-1e6, 1e6, 400)
-        y = a * x + b
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
+        from calc_sampling import curve
 
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        x, y = curve(('line', a, b), lambda x: a * x + b, *self.viewport())
 
         string, c, d = "", "", ""
 
@@ -1030,26 +1401,13 @@ class Calculator:
 
         string = "Прямая: " + "y = " + c + d
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def parabola(self, a, b, c):
-        x = np.linspace(-11, 11, 400)
-        y = a * x ** 2 + b * x + c
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
+        from calc_sampling import curve
 
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
+        x, y = curve(('parabola', a, b, c), lambda x: a * x ** 2 + b * x + c, *self.viewport())
 
         string, d, e, f, g = "", "", "", "", "Парабола: "
 
@@ -1108,31 +1466,13 @@ class Calculator:
 
         string = g + "y = " + d + e + f
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def hyperbola(self, a, b, c):
-        x = np.linspace(-11, 11, 400)
-        y = a / (x + b) + c
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
+        from calc_sampling import curve
 
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        x, y = curve(('hyperbola', a, b, c), lambda x: a / (x + b) + c, *self.viewport())
 
         string, d, e, f, g = "", "", "", "", "Гипербола: "
 
@@ -1167,31 +1507,15 @@ class Calculator:
 
         string = g + "y = " + d + e + f
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def circle(self, a, b, c):
-        t = np.linspace(0, 2 * np.pi, 100)
-        x = a + c * np.cos(t)
-        y = b + c * np.sin(t)
+        from calc_implicit import curve as implicit_curve
 
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        curves = implicit_curve(
+            ('circle', a, b, c), lambda x, y: (x - a) ** 2 + (y - b) ** 2 - c ** 2, *self.viewport()
+        )
 
         string, d, e = "", "", ""
 
@@ -1211,30 +1535,14 @@ class Calculator:
 
         string = "Окружность: " + d + e + " = " + str(c ** 2)
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot(curves, string)
         return "График построен"
 
     def moduleX(self, a, b, c):
-        x = np.linspace(-11, 11, 400)
-        y = a * np.abs(x + b) + c
-
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
+        import numpy as np
+        from calc_sampling import curve
 
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        x, y = curve(('moduleX', a, b, c), lambda x: a * np.abs(x + b) + c, *self.viewport())
 
         string, d, e, f, g = "", "", "", "", "Модуль Х: "
 
@@ -1286,32 +1594,14 @@ class Calculator:
 
         string = g + "y = " + d + e + f
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def moduleY(self, a, b):
-        x = np.linspace(-10, 10, 400)
-        y_plus = a * x + b
-        y_minus = -a * x - b
-
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y_plus, 'b-', linewidth=3, label='График')
-        plt.plot(x, y_minus, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
+        import numpy as np
+        from calc_implicit import curve as implicit_curve
 
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        curves = implicit_curve(('moduleY', a, b), lambda x, y: np.abs(y) - (a * x + b), *self.viewport())
 
         string, d, e, g = "", "", "", "Модуль Y: "
 
@@ -1345,32 +1635,14 @@ class Calculator:
 
         string = g + "|y| = " + d + e
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot(curves, string)
         return "График построен"
 
     def moduleXY(self, a, b):
-        x = np.linspace(-11, 11, 400)
-        y_plus = a * np.abs(x) + b
-        y_minus = -a * np.abs(x) - b
+        import numpy as np
+        from calc_implicit import curve as implicit_curve
 
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y_plus, 'b-', linewidth=3, label='График')
-        plt.plot(x, y_minus, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        curves = implicit_curve(('moduleXY', a, b), lambda x, y: np.abs(y) - (a * np.abs(x) + b), *self.viewport())
 
         string, d, e, g = "", "", "", "Модуль Х и Y: "
 
@@ -1404,30 +1676,14 @@ class Calculator:
 
         string = g + "|y| = " + d + e
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot(curves, string)
         return "График построен"
 
     def sinus(self, a, b):
-        x = np.linspace(-11, 11, 400)
-        y = a * np.sin(x) + b
-
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
+        import numpy as np
+        from calc_sampling import curve
 
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        x, y = curve(('sinus', a, b), lambda x: a * np.sin(x) + b, *self.viewport())
 
         string, c, d, e = "", "", "", "Синусоида: "
 
@@ -1461,30 +1717,14 @@ class Calculator:
 
         string = e + "y = " + c + d
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def cosinus(self, a, b):
-        x = np.linspace(-11, 11, 400)
-        y = a * np.cos(x) + b
-
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
+        import numpy as np
+        from calc_sampling import curve
 
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        x, y = curve(('cosinus', a, b), lambda x: a * np.cos(x) + b, *self.viewport())
 
         string, c, d, e = "", "", "", "Косинусоида: "
 
@@ -1518,30 +1758,14 @@ class Calculator:
 
         string = e + "y = " + c + d
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def tang(self, a, b):
-        x = np.linspace(-11, 11, 400)
-        y = a * np.tan(x) + b
-
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
+        import numpy as np
+        from calc_sampling import curve
 
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        x, y = curve(('tang', a, b), lambda x: a * np.tan(x) + b, *self.viewport())
 
         string, c, d, e = "", "", "", "Тангенс: "
 
@@ -1575,30 +1799,14 @@ class Calculator:
 
         string = e + "y = " + c + d
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def cotang(self, a, b):
-        x = np.linspace(-10, 10, 400)
-        y = a / np.tan(x) + b
-
-        plt.figure(figsize=(10, 10))
-        plt.plot(x, y, 'b-', linewidth=3, label='График')
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
+        import numpy as np
+        from calc_sampling import curve
 
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
-
-        plt.xlim(-11, 11)
-        plt.ylim(-11, 11)
+        x, y = curve(('cotang', a, b), lambda x: a / np.tan(x) + b, *self.viewport())
 
         string, c, d, e = "", "", "", "Котангенс: "
 
@@ -1632,38 +1840,16 @@ class Calculator:
 
         string = e + "y = " + c + d
 
-        plt.title(string, fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot([(x, y)], string)
         return "График построен"
 
     def heart(self, a):
-        x = np.linspace(-1.5, 1.5, 1000) * a
-        y = np.linspace(-1.5, 1.5, 1000) * a
-        X, Y = np.meshgrid(x, y)
-
-        f = (X ** 2 + Y ** 2 - 1) ** 3 - X ** 2 * Y ** 3
-
-        plt.figure(figsize=(10, 10))
-        plt.contour(X, Y, f, levels=[0], colors='#ff69b4', linewidth=10, label="Сердце")
-
-        plt.axhline(y=0, color='black', linestyle='-', linewidth=2.5, label='Ось Х')
-        plt.axvline(x=0, color='black', linestyle='-', linewidth=2.5, label='Ось Y')
-
-        plt.arrow(10, 0, 0.5, 0, head_width=0.3, head_length=0.3, fc='black', ec='black')
-        plt.arrow(0, 10, 0, 0.5, head_width=0.3, head_length=0.3, fc='black', ec='black')
-
-        plt.text(10.5, -1, 'X', fontsize=14, fontweight='bold', color='black')
-        plt.text(-0.8, 10.3, 'Y', fontsize=14, fontweight='bold', color='black')
+        from calc_implicit import curve as implicit_curve
 
-        plt.xlim(-1.5 * a, 1.5 * a)
-        plt.ylim(-1.5 * a, 1.5 * a)
+        xlim, ylim = self.viewport((-1.5 * a, 1.5 * a))
+        curves = implicit_curve(('heart',), lambda x, y: (x ** 2 + y ** 2 - 1) ** 3 - x ** 2 * y ** 3, xlim, ylim)
 
-        plt.title(f'y = С любовью, NebulaStack!', fontsize=14)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.show()
+        self.show_plot(curves, 'y = С любовью, NebulaStack!', xlim, ylim, '#ff69b4')
         return "График построен"
 
     def on_button_enter(self, event, button, color):
@@ -1677,7 +1863,7 @@ class Calculator:
         button.config(
             bg=self.colors['card'],
             fg=self.colors['text'],
-            text=button.original_text
+            text=self.t(button.original_text)
         )
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+import calc_factor
+import calc_factorial
+import calc_primes
+from calc_engine import CalcEngine
+
+REPEAT = 5
+BATCH_TIME = 0.002
+THRESHOLD = 0.25
+# Разница меньше 20 мкс - шум: холодный вызов за ~10 мкс от запуска к запуску гуляет до 12 мкс
+MIN_DELTA = 2e-5
+# Операции с кэшами между вызовами: меряем одиночные холодные вызовы, а не пачку
+COLD = ("prime_factors", "factorial", "double_fact")
+BASELINE_FILE = 'bench_baseline.json'
+
+
+def next_prime(n):
+    while not calc_primes.is_prime(n):
+        n += 1
+    return n
+
+
+def semiprime(digits):
+    # Меньший множитель не длиннее 9 цифр: rho тратит на него около sqrt(p) шагов
+    small = min(digits // 2, 9)
+    return next_prime(10 ** small) * next_prime(3 * 10 ** (digits - small))
+
+
+def number_tiers():
+    return {
+        "small": (97, 13),
+        "1e9": (10 ** 9 + 7, 10 ** 9 - 63),
+        "1e18": (10 ** 18 + 9, 10 ** 18 - 11),
+        "1e30": (10 ** 30 + 57, 10 ** 30 - 33)
+    }
+
+
+def engine_cases(engine):
+    tiers = number_tiers()
+    cases = []
+
+    for name in ("add", "subtract", "multiply", "divide", "gcd", "lcm"):
+        for tier, (a, b) in tiers.items():
+            cases.append((f"{name}[{tier}]", engine.evaluate, (name, a, b)))
+    for tier, (a, b) in tiers.items():
+        cases.append((f"power[{tier}]", engine.evaluate, ("power", a, 3)))
+        cases.append((f"sqrt[{tier}]", engine.evaluate, ("sqrt", a)))
+        cases.append((f"logarithm[{tier}]", engine.evaluate, ("logarithm", 10, a)))
+
+    for tier, digits in (("small", 2), ("1e9", 9), ("1e18", 18), ("1e30", 30)):
+        prime = next_prime(10 ** digits)
+        cases.append((f"is_prime[{tier}]", engine.evaluate, ("is_prime", prime)))
+        cases.append((f"prime_factors[{tier}]", engine.evaluate, ("prime_factors", semiprime(digits))))
+
+    for n in (20, 1000, 10 ** 5, 250000):
+        cases.append((f"factorial[{n}]", engine.evaluate, ("factorial", n)))
+        cases.append((f"double_fact[{n}]", engine.evaluate, ("double_fact", n + 1)))
+
+    for name in ("sin", "cos", "tan", "ctg", "deg_to_rad", "rad_to_deg", "abs", "integer", "fractional"):
+        cases.append((f"{name}[small]", engine.evaluate, (name, 37.5)))
+    cases.append(("solve_linear[small]", engine.evaluate, ("solve_linear", 3, -7)))
+    cases.append(("solve_quadratic[small]", engine.evaluate, ("solve_quadratic", 1, -3, 2)))
+    cases.append(("solve_quadratic[complex]", engine.evaluate, ("solve_quadratic", 1, 0, 2)))
+    return cases
+
+
+def plot_cases():
+    import numpy as np
+
+    from calc_implicit import trace
+    from calc_sampling import VIEW, sample
+
+    # Те же формулы, что у графиков в Calculator_v.3.py
+    functions = {
+        "line": lambda x: 2 * x + 1,
+        "parabola": lambda x: x ** 2 - 3 * x + 2,
+        "hyperbola": lambda x: 1 / (x + 1) + 2,
+        "moduleX": lambda x: 2 * np.abs(x + 1) - 3,
+        "sinus": lambda x: 3 * np.sin(x),
+        "cosinus": lambda x: 3 * np.cos(x),
+        "tang": lambda x: np.tan(x),
+        "cotang": lambda x: 1 / np.tan(x)
+    }
+    curves = {
+        "circle": lambda x, y: (x - 1) ** 2 + (y + 2) ** 2 - 25,
+        "moduleY": lambda x, y: np.abs(y) - (2 * x + 1),
+        "moduleXY": lambda x, y: np.abs(y) - (2 * np.abs(x) - 3),
+        "heart": lambda x, y: (x ** 2 + y ** 2 - 1) ** 3 - x ** 2 * y ** 3
+    }
+
+    cases = []
+    for name, f in functions.items():
+        cases.append((f"{name}[plot]", sample, (f,)))
+        cases.append((f"{name}[dense]", sample, (f, VIEW, VIEW, 4096)))
+    for name, F in curves.items():
+        view = (-1.5, 1.5) if name == "heart" else VIEW
+        cases.append((f"{name}[plot]", trace, (F, view, view)))
+        cases.append((f"{name}[dense]", trace, (F, view, view, 128, 6)))
+    return cases
+
+
+def reset():
+    # Перед каждым замером сбрасываем кэши, иначе меряется поиск в словаре
+    calc_factor.cache.clear()
+    calc_factorial.checkpoints.clear()
+
+
+def measure(func, args, repeat=REPEAT, cold=False):
+    reset()
+    started = time.perf_counter()
+    func(*args)
+    first = time.perf_counter() - started
+    loops = max(1, int(BATCH_TIME / max(first, 1e-9)))
+
+    # Медиана повторов, а не лучший: одиночный удачный прогон не должен становиться эталоном
+    times = []
+    if cold:
+        # Сброс перед каждым вызовом, вне замеряемого участка
+        for _ in range(repeat * loops):
+            reset()
+            started = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - started)
+        return statistics.median(times)
+
+    for _ in range(repeat):
+        reset()
+        started = time.perf_counter()
+        for _ in range(loops):
+            func(*args)
+        times.append((time.perf_counter() - started) / loops)
+    return statistics.median(times)
+
+
+def run(pattern=None, repeat=REPEAT, plots=True):
+    engine = CalcEngine(cache_bytes=0)
+    cases = engine_cases(engine)
+    if plots:
+        cases += plot_cases()
+
+    # Иначе разложения дописываются в factor_cache.jsonl прямо внутри замера
+    path, calc_factor.cache.path = calc_factor.cache.path, None
+    results = {}
+    try:
+        for name, func, args in cases:
+            if pattern and pattern not in name:
+                continue
+            results[name] = measure(func, args, repeat, name.startswith(COLD))
+            print(f"{name:32} {format_time(results[name]):>12}", file=sys.stderr)
+    finally:
+        calc_factor.cache.path = path
+    return results
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    regressions = []
+    for name, seconds in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if seconds > old * (1 + threshold) and seconds - old > MIN_DELTA:
+            regressions.append((name, old, seconds))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры операций калькулятора без GUI")
+    parser.add_argument('-k', '--filter', help="только замеры, в имени которых есть подстрока")
+    parser.add_argument('--save', nargs='?', const=BASELINE_FILE, help="записать результаты как эталон")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, help="сравнить с эталоном")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="допустимое замедление, доля")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="повторов на замер")
+    parser.add_argument('--no-plots', action='store_true', help="без графиков (не нужен numpy)")
+    options = parser.parse_args(argv)
+
+    results = run(options.filter, options.repeat, not options.no_plots)
+
+    if options.save:
+        with open(options.save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results
+            }, f, indent=2, ensure_ascii=False)
+
+    if options.compare:
+        with open(options.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, options.threshold)
+        for name, old, new in regressions:
+            print(f"Регрессия {name}: {format_time(old)} -> {format_time(new)} (+{(new / old - 1) * 100:.0f}%)")
+        if regressions:
+            return 1
+        print(f"Регрессий нет ({len(results)} замеров)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
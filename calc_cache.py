@@ -0,0 +1,135 @@
+import json
+import math
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+CACHE_BYTES = 64 * 2 ** 20
+CACHE_FILE = 'calc_cache.jsonl'
+# Узел OrderedDict и служебные кортежи записи, которых не видно в getsizeof ключа и значения
+ENTRY_OVERHEAD = 200
+
+
+def normalize(value, integer=False):
+    # Ключ учитывает тип: 2 и 2.0 дают разные результаты у add, поэтому float помечается отдельно
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        if integer and value.is_integer():
+            return int(value)
+        return ('f', value)
+    return None
+
+
+def _size(value):
+    return sys.getsizeof(value)
+
+
+def _encode(value):
+    # Большие int пишем в hex: str() для них ограничен 4300 цифрами
+    if isinstance(value, tuple):
+        return {'f': value[1]}
+    if isinstance(value, bool) or not isinstance(value, int):
+        return value
+    return {'i': hex(value)}
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if 'i' in value:
+            return int(value['i'], 16)
+        return ('f', float(value['f']))
+    return value
+
+
+class ResultCache:
+    def __init__(self, max_bytes=CACHE_BYTES, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = path is None
+
+    def _load(self):
+        self._loaded = True
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                            key = (record['op'], tuple(_decode(a) for a in record['args']))
+                            self._put(key, _decode(record['result']))
+                        except (ValueError, KeyError, TypeError):
+                            continue
+        except OSError:
+            pass
+
+    def _put(self, key, value):
+        nbytes = ENTRY_OVERHEAD + _size(key[1]) + _size(value) + sum(_size(a) for a in key[1])
+        if nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size -= self._entries.pop(key)[1]
+        self._entries[key] = (value, nbytes)
+        self.size += nbytes
+        while self.size > self.max_bytes:
+            self.size -= self._entries.popitem(last=False)[1][1]
+
+    def get(self, key):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._put(key, value)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def save(self):
+        if self.path is None or not self._loaded:
+            return
+        with self._lock:
+            records = [
+                json.dumps({'op': key[0], 'args': [_encode(a) for a in key[1]], 'result': _encode(value)},
+                           ensure_ascii=False)
+                for key, (value, nbytes) in self._entries.items()
+            ]
+
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(record + '\n' for record in records))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
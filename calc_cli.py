@@ -0,0 +1,211 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+from calc_cache import CACHE_BYTES
+from calc_engine import CalcEngine
+from calc_parallel import ParallelEvaluator
+from calc_precision import DIGITS, MODES, Precision
+
+CHUNK_SIZE = 1000
+WINDOW = 10000
+
+
+def detect_format(path):
+    return 'jsonl' if os.path.splitext(path)[1].lower() in ('.jsonl', '.json', '.ndjson') else 'csv'
+
+
+def read_rows(f, fmt):
+    # Построчное чтение: в памяти только текущая строка файла
+    if fmt == 'jsonl':
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield number, None, None
+                continue
+            if isinstance(record, dict):
+                yield number, record.get('operation'), record.get('args', [])
+            elif isinstance(record, list) and record:
+                yield number, record[0], record[1:]
+            else:
+                yield number, None, None
+    else:
+        for number, row in enumerate(csv.reader(f), 1):
+            if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+                continue
+            if number == 1 and row[0].strip().lower() == 'operation':
+                continue
+            yield number, row[0].strip(), [value.strip() for value in row[1:] if value.strip()]
+
+
+def parse_arg(engine, value):
+    if isinstance(value, (int, float)):
+        return value
+    value = str(value)
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return engine.precision.number(value)
+    except (ValueError, ArithmeticError):
+        return engine.evaluate_expression(value)
+
+
+def parse_row(engine, name, args):
+    if not name or args is None:
+        raise ValueError("Неверный формат строки")
+    return [parse_arg(engine, value) for value in args]
+
+
+def error_text(error):
+    # Ожидаемые ошибки операций уже описаны по-русски, у прочих указываем тип
+    if isinstance(error, (ValueError, ZeroDivisionError, OverflowError, TypeError)) and str(error):
+        return str(error)
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+def evaluate_rows(engine, rows):
+    # Любая ошибка в строке попадает в её запись, а не обрывает весь прогон
+    for number, name, args in rows:
+        record = {'row': number, 'operation': name}
+        try:
+            record['result'] = engine.evaluate(name, *parse_row(engine, name, args))
+        except Exception as e:
+            record['error'] = error_text(e)
+        yield record
+
+
+def evaluate_rows_parallel(engine, rows, evaluator, window=WINDOW):
+    # Строки читаются окнами: память ограничена окном, а не размером файла
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= window:
+            yield from _evaluate_window(engine, batch, evaluator)
+            batch = []
+    if batch:
+        yield from _evaluate_window(engine, batch, evaluator)
+
+
+def _evaluate_window(engine, batch, evaluator):
+    records = []
+    tasks = []
+    for number, name, args in batch:
+        record = {'row': number, 'operation': name}
+        try:
+            tasks.append((name, parse_row(engine, name, args)))
+            record['task'] = len(tasks) - 1
+        except Exception as e:
+            record['error'] = error_text(e)
+        records.append(record)
+
+    results = evaluator.map(tasks)
+    for record in records:
+        if 'task' in record:
+            success, value = results[record.pop('task')]
+            if success:
+                record['result'] = value
+            else:
+                record['error'] = error_text(value)
+        yield record
+
+
+def format_result(result):
+    if isinstance(result, float):
+        return repr(result)
+    return str(result)
+
+
+def write_records(records, f, fmt, chunk_size=CHUNK_SIZE):
+    # Результаты копятся пачками и пишутся одним вызовом write
+    total = errors = 0
+    chunk = []
+    writer = None
+    if fmt == 'csv':
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['row', 'operation', 'result', 'error'])
+
+    for record in records:
+        total += 1
+        if 'error' in record:
+            errors += 1
+
+        if fmt == 'jsonl':
+            if 'result' in record and not isinstance(record['result'], (int, float, str)):
+                record['result'] = format_result(record['result'])
+            chunk.append(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            chunk.append([record['row'], record['operation'],
+                          format_result(record['result']) if 'result' in record else '',
+                          record.get('error', '')])
+
+        if len(chunk) >= chunk_size:
+            if writer is None:
+                f.write(''.join(chunk))
+            else:
+                writer.writerows(chunk)
+            chunk = []
+
+    if chunk:
+        if writer is None:
+            f.write(''.join(chunk))
+        else:
+            writer.writerows(chunk)
+    return total, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетное вычисление строк вида operation,arg1,arg2,...")
+    parser.add_argument('input', help="CSV или JSONL файл, '-' - стандартный ввод")
+    parser.add_argument('-o', '--output', default='-', help="файл результатов, по умолчанию стандартный вывод")
+    parser.add_argument('-f', '--format', choices=('csv', 'jsonl'), help="формат ввода")
+    parser.add_argument('--output-format', choices=('csv', 'jsonl'), help="формат вывода")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="строк в одной записи на диск")
+    parser.add_argument('-p', '--precision', choices=MODES, default='float', help="режим точности")
+    parser.add_argument('--digits', type=int, default=DIGITS, help="значащих цифр в режиме decimal")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="число процессов, 0 - по числу ядер")
+    parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES // 2 ** 20,
+                        help="память под кэш повторяющихся строк, МиБ")
+    options = parser.parse_args(argv)
+
+    # Факториалы в выводе печатаются полностью, без ограничения на число цифр
+    if hasattr(sys, 'set_int_max_str_digits'):
+        sys.set_int_max_str_digits(0)
+
+    input_format = options.format or (detect_format(options.input) if options.input != '-' else 'csv')
+    output_format = options.output_format or (
+        detect_format(options.output) if options.output != '-' else input_format)
+
+    precision = Precision(options.precision, options.digits)
+    engine = CalcEngine(cache_bytes=options.cache_mb * 2 ** 20, precision=precision)
+    source = sys.stdin if options.input == '-' else open(options.input, 'r', encoding='utf-8', newline='')
+    target = sys.stdout if options.output == '-' else open(options.output, 'w', encoding='utf-8', newline='')
+    evaluator = ParallelEvaluator(options.jobs or None, precision=precision) if options.jobs != 1 else None
+    try:
+        rows = read_rows(source, input_format)
+        if evaluator is None:
+            records = evaluate_rows(engine, rows)
+        else:
+            records = evaluate_rows_parallel(engine, rows, evaluator)
+        total, errors = write_records(records, target, output_format, options.chunk_size)
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"Строк: {total}, ошибок: {errors}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+import math
+import time
+from collections import namedtuple
+from functools import partial
+
+import calc_cache
+import calc_expr
+import calc_factor
+import calc_factorial
+import calc_gcd
+import calc_metrics
+import calc_precision
+import calc_primes
+
+# У операции с variadic=True arity - наименьшее число аргументов
+Operation = namedtuple('Operation', ['name', 'arity', 'func', 'pure', 'variadic', 'cached'],
+                       defaults=(False, False, False))
+
+# Дорогие операции над целыми: только их результаты стоит держать в кэше.
+# Они сами приводят аргумент к int, поэтому 5.0 и 5 для них один ключ
+INTEGER_ARGS = {"factorial", "double_fact", "is_prime", "prime_factors", "gcd", "lcm"}
+
+
+class CalcEngine:
+    def __init__(self, cache_bytes=calc_cache.CACHE_BYTES, cache_path=None, precision=None):
+        self.operations = {}
+        self._functions = None
+        self.cache = calc_cache.ResultCache(cache_bytes, cache_path)
+        self.precision = precision or calc_precision.Precision()
+        self.metrics = calc_metrics.Metrics()
+
+        for name, arity in [
+            ("add", 2),
+            ("subtract", 2),
+            ("multiply", 2),
+            ("divide", 2),
+            ("power", 2),
+            ("sqrt", 1),
+            ("factorial", 1),
+            ("double_fact", 1),
+            ("is_prime", 1),
+            ("prime_factors", 1),
+            ("sin", 1),
+            ("cos", 1),
+            ("tan", 1),
+            ("ctg", 1),
+            ("deg_to_rad", 1),
+            ("rad_to_deg", 1),
+            ("solve_linear", 2),
+            ("solve_quadratic", 3),
+            ("logarithm", 2),
+            ("abs", 1),
+            ("fractional", 1),
+            ("integer", 1)
+        ]:
+            self.register(name, arity, getattr(self, name), pure=True, cached=name in INTEGER_ARGS)
+        # НОД и НОК любого числа аргументов, а также одного массива или файла
+        for name in ("gcd", "lcm"):
+            self.register(name, 1, getattr(self, name), pure=True, variadic=True, cached=True)
+
+    def register(self, name, arity, func, pure=False, variadic=False, cached=False):
+        operation = Operation(name, arity, func, pure, variadic, cached)
+        self.operations[name] = operation
+        self._functions = None
+        return operation
+
+    def get(self, name):
+        try:
+            return self.operations[name]
+        except KeyError:
+            raise ValueError(f"Неизвестная операция: {name}")
+
+    def evaluate(self, name, *args):
+        operation = self.get(name)
+        self.check_arity(operation, len(args))
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            result = self._dispatch(operation, args)
+        except Exception as e:
+            self.metrics.record(name, time.perf_counter() - wall, time.process_time() - cpu, error=e)
+            raise
+        self.metrics.record(name, time.perf_counter() - wall, time.process_time() - cpu, result)
+        return result
+
+    def check_arity(self, operation, count):
+        if operation.variadic:
+            if count < operation.arity:
+                raise ValueError(f"{operation.name}: ожидается аргументов - не меньше {operation.arity}, получено - {count}")
+        elif count != operation.arity:
+            raise ValueError(f"{operation.name}: ожидается аргументов - {operation.arity}, получено - {count}")
+
+    def _dispatch(self, operation, args):
+        name = operation.name
+        if not operation.pure:
+            return operation.func(*args)
+        if not operation.cached:
+            # Дешёвые операции: поиск в кэше стоил бы дороже самого вычисления
+            with self.precision.scope():
+                return operation.func(*args)
+
+        key = self.cache_key(name, args)
+        if key is None:
+            with self.precision.scope():
+                return operation.func(*args)
+        result = self.cache.get(key)
+        if result is None:
+            with self.precision.scope():
+                result = operation.func(*args)
+            self.cache.put(key, result)
+        return result
+
+    def cache_key(self, name, args):
+        operation = self.operations.get(name)
+        if operation is None or not operation.cached:
+            return None
+        key = tuple(calc_cache.normalize(a, True) for a in args)
+        if None in key:
+            return None
+        return name, key
+
+    def evaluate_expression(self, text, max_bits=calc_expr.MAX_POWER_BITS, /, **variables):
+        if self._functions is None:
+            self._functions = {name: partial(self.evaluate, name) for name in self.operations}
+        return calc_expr.evaluate(text, self._functions, self.precision, max_bits, **variables)
+
+    def has_calls(self, text):
+        # Вызов операции в выражении может считаться сколь угодно долго, в отличие от арифметики
+        return bool(calc_expr.compile_expression(text, self.precision.exact).calls)
+
+    def evaluate_many(self, name, rows):
+        operation = self.get(name)
+        func = operation.func
+        for args in rows:
+            self.check_arity(operation, len(args))
+            # yield вне контекста: иначе точность Decimal действовала бы и в коде вызывающего
+            with self.precision.scope():
+                result = func(*args)
+            yield result
+
+    def evaluate_array(self, name, *columns):
+        import calc_vector
+
+        self.get(name)
+        if name not in calc_vector.OPERATIONS:
+            raise ValueError(f"{name}: нет пакетной версии операции")
+        return calc_vector.OPERATIONS[name](*columns)
+
+    def add(self, a, b):
+        return a + b
+
+    def subtract(self, a, b):
+        return a - b
+
+    def multiply(self, a, b):
+        return a * b
+
+    def divide(self, a, b):
+        if b == 0:
+            raise ZeroDivisionError("Деление на ноль")
+        return self.precision.divide(a, b)
+
+    def power(self, a, b):
+        return self.precision.power(a, b)
+
+    def sqrt(self, x):
+        if x < 0:
+            raise ValueError("Корень из отрицательного числа")
+        return self.precision.sqrt(x)
+
+    def factorial(self, n):
+        if n < 0:
+            raise ValueError("Факториал отрицательного числа")
+        return calc_factorial.factorial(int(n))
+
+    def double_fact(self, n):
+        n = int(n)
+        if n < 0:
+            raise ValueError("Отрицательное число")
+        return calc_factorial.double_factorial(n)
+
+    def is_prime(self, n):
+        n = int(n)
+        if n < 1:
+            return "Функция работает только на натуральных числах!"
+        if n == 1:
+            return "Единица"
+        return "Простое" if calc_primes.is_prime(n) else "Составное"
+
+    def prime_factors(self, n):
+        n = int(n)
+        if n == 0:
+            return "0"
+        if n == 1:
+            return "1"
+
+        result = calc_factor.factorize(abs(n))
+
+        if n < 0:
+            result.insert(0, -1)
+
+        return ' × '.join(map(str, result))
+
+    def gcd(self, *values):
+        if len(values) == 1 and not isinstance(values[0], (int, float)):
+            return calc_gcd.gcd(values[0])
+        return calc_gcd.gcd(values)
+
+    def lcm(self, *values):
+        if len(values) == 1 and not isinstance(values[0], (int, float)):
+            return calc_gcd.lcm(values[0])
+        return calc_gcd.lcm(values)
+
+    def sin(self, a):
+        return self.precision.real(math.sin(math.radians(a)))
+
+    def cos(self, a):
+        return self.precision.real(math.cos(math.radians(a)))
+
+    def tan(self, a):
+        if (a - 90) % 180 == 0:
+            raise ZeroDivisionError("Деление на ноль")
+
+        if a % 180 == 0:
+            return 0
+        else:
+            return self.precision.real(math.tan(math.radians(a)))
+
+    def ctg(self, a):
+        if a % 180 == 0:
+            raise ZeroDivisionError("Деление на ноль")
+        if (a - 90) % 180 == 0:
+            return 0
+        else:
+            return self.precision.real(1 / math.tan(math.radians(a)))
+
+    def deg_to_rad(self, deg):
+        return self.precision.real(math.radians(deg))
+
+    def rad_to_deg(self, rad):
+        return self.precision.real(math.degrees(rad))
+
+    def solve_linear(self, a, b):
+        if a == 0:
+            if b == 0:
+                return "Бесконечно решений"
+            return "Нет решений"
+        return self.precision.divide(-b, a)
+
+    def solve_quadratic(self, a, b, c):
+        if a == 0:
+            return self.solve_linear(b, c)
+
+        p = self.precision
+        D = b ** 2 - 4 * a * c
+        if D > 0:
+            x1 = p.divide(-b + p.sqrt(D), 2 * a)
+            x2 = p.divide(-b - p.sqrt(D), 2 * a)
+            return f"x₁ = {x1}, x₂ = {x2}"
+        elif D == 0:
+            x = p.divide(-b, 2 * a)
+            return f"x = {x} (кратный)"
+        else:
+            real = p.divide(-b, 2 * a)
+            imag = p.divide(p.sqrt(-D), 2 * a)
+            return f"x₁ = {real} + {imag}i, x₂ = {real} - {imag}i"
+
+    def logarithm(self, base, a):
+        if base <= 0 or base == 1:
+            raise ValueError("Основание должно быть >0 и ≠1")
+        if a <= 0:
+            raise ValueError("Аргумент должен быть >0")
+        return self.precision.log(a, base)
+
+    def abs(self, a):
+        return abs(a)
+
+    def integer(self, x):
+        if x >= 0:
+            return int(x)
+        else:
+            if x - int(x) < 0:
+                return int(x) - 1
+
+            else:
+                return int(x)
+
+    def fractional(self, x):
+        if x >= 0:
+            return x - int(x)
+        else:
+            if x - int(x) < 0:
+                return x - (int(x) - 1)
+
+            else:
+                return 0
@@ -0,0 +1,163 @@
+import ast
+import math
+from contextlib import nullcontext
+from functools import lru_cache, partial
+
+CACHE_SIZE = 1024
+MAX_POWER_BITS = 32 * 2 ** 20
+# Бюджет для полей, которые считаются прямо в окне: такие числа возводятся и умножаются за миллисекунды
+INTERACTIVE_BITS = 2 ** 18
+
+CONSTANTS = {
+    'pi': math.pi,
+    'π': math.pi,
+    'e': math.e,
+    'tau': math.tau
+}
+
+_REPLACEMENTS = [('^', '**'), ('×', '*'), ('÷', '/'), (':', '/'), ('−', '-')]
+
+_BINARY = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod)
+_UNARY = (ast.UAdd, ast.USub)
+
+
+class NumberTooLarge(ValueError):
+    pass
+
+
+def safe_power(a, b, max_bits=MAX_POWER_BITS):
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        if b * a.bit_length() > max_bits:
+            raise NumberTooLarge("Слишком большое число")
+    return a ** b
+
+
+def safe_multiply(a, b, max_bits=MAX_POWER_BITS):
+    if isinstance(a, int) and isinstance(b, int) and a.bit_length() + b.bit_length() > max_bits:
+        raise NumberTooLarge("Слишком большое число")
+    return a * b
+
+
+class Expression:
+    def __init__(self, text, code, names, exact=False, calls=frozenset(), constants=frozenset()):
+        self.text = text
+        self.code = code
+        self.names = names
+        self.exact = exact
+        self.calls = calls
+        self.constants = constants
+
+    def __call__(self, functions=None, precision=None, max_bits=MAX_POWER_BITS, /, **variables):
+        multiply = partial(safe_multiply, max_bits=max_bits)
+        if self.exact:
+            # Точный режим: литералы, деление и степень идут через объект точности
+            namespace = {'__builtins__': {}, '_power': partial(precision.power, max_bits=max_bits),
+                         '_divide': precision.divide, '_number': precision.number, '_multiply': multiply}
+            namespace.update(precision.constants(self.constants, max_bits))
+        else:
+            namespace = {'__builtins__': {}, '_power': partial(safe_power, max_bits=max_bits), '_multiply': multiply}
+            namespace.update(CONSTANTS)
+        if functions:
+            namespace.update(functions)
+        namespace.update(variables)
+
+        for name in self.names:
+            if name not in namespace:
+                raise ValueError(f"Неизвестное имя: {name}")
+
+        return eval(self.code, namespace)
+
+
+class _Compiler(ast.NodeTransformer):
+    def __init__(self, source, exact=False):
+        self.source = source
+        self.exact = exact
+        self.names = set()
+        self.calls = set()
+        self.constants = set()
+
+    def generic_visit(self, node):
+        raise ValueError(f"Недопустимая конструкция: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float, complex):
+            raise ValueError("Допустимы только числа")
+        if self.exact and type(node.value) is float:
+            # Берём запись из исходника: значение float уже округлено
+            text = ast.get_source_segment(self.source, node)
+            return ast.copy_location(
+                ast.Call(func=ast.Name(id='_number', ctx=ast.Load()), args=[ast.Constant(text)], keywords=[]),
+                node
+            )
+        return node
+
+    def visit_Name(self, node):
+        if node.id.startswith('_'):
+            raise ValueError(f"Недопустимое имя: {node.id}")
+        if node.id.lower() in CONSTANTS:
+            node.id = node.id.lower()
+            self.constants.add(node.id)
+        else:
+            self.names.add(node.id)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY):
+            raise ValueError(f"Недопустимый оператор: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_BinOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        # Степень и умножение проверяют длину результата, деление в точном режиме идёт через точность
+        helpers = {ast.Pow: '_power', ast.Mult: '_multiply'}
+        if self.exact:
+            helpers[ast.Div] = '_divide'
+        helper = helpers.get(type(node.op))
+        if helper is not None:
+            return ast.copy_location(
+                ast.Call(func=ast.Name(id=helper, ctx=ast.Load()), args=[left, right], keywords=[]),
+                node
+            )
+        if not isinstance(node.op, _BINARY):
+            raise ValueError(f"Недопустимый оператор: {type(node.op).__name__}")
+        node.left, node.right = left, right
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ValueError("Допустим только вызов операции по имени")
+        self.visit_Name(node.func)
+        self.calls.add(node.func.id)
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text, exact=False):
+    source = text.strip()
+    for old, new in _REPLACEMENTS:
+        source = source.replace(old, new)
+    if not source:
+        raise ValueError("Пустое выражение")
+
+    try:
+        tree = ast.parse(source, mode='eval')
+    except SyntaxError:
+        raise ValueError(f"Неверное выражение: {text}")
+
+    compiler = _Compiler(source, exact)
+    tree = ast.fix_missing_locations(compiler.visit(tree))
+    return Expression(text, compile(tree, '<expression>', 'eval'), frozenset(compiler.names), exact,
+                      frozenset(compiler.calls), frozenset(compiler.constants))
+
+
+def evaluate(text, functions=None, precision=None, max_bits=MAX_POWER_BITS, /, **variables):
+    exact = precision is not None and precision.exact
+    with precision.scope() if exact else nullcontext():
+        return compile_expression(text, exact)(functions, precision, max_bits, **variables)
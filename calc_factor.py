@@ -0,0 +1,169 @@
+import json
+import math
+import os
+import random
+import threading
+from collections import OrderedDict
+
+import calc_primes
+
+TRIAL_LIMIT = 10000
+CACHE_SIZE = 4096
+CACHE_FILE = 'factor_cache.jsonl'
+
+SMALL_PRIMES = tuple(calc_primes.sieve.primes(TRIAL_LIMIT))
+
+
+def _record(n, factors):
+    return json.dumps({'n': str(n), 'factors': [str(p) for p in factors]}) + '\n'
+
+
+class FactorCache:
+    # Файл по умолчанию не ведётся: его включает GUI, иначе CLI и процессы пула мусорят в текущей папке
+    def __init__(self, maxsize=CACHE_SIZE, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = path is None
+        self._lines = 0
+
+    def _load(self):
+        self._loaded = True
+        if self.path is None:
+            return
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._lines += 1
+                        try:
+                            record = json.loads(line)
+                            self._put(int(record['n']), [int(p) for p in record['factors']])
+                        except (ValueError, KeyError, TypeError):
+                            continue
+        except OSError:
+            pass
+        if self._lines > 2 * self.maxsize:
+            self._compact()
+
+    def _compact(self):
+        # В памяти только последние maxsize разложений: файл переписывается ими же
+        temp = self.path + '.tmp'
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                f.writelines(_record(n, factors) for n, factors in self._entries.items())
+            os.replace(temp, self.path)
+            self._lines = len(self._entries)
+        except OSError:
+            pass
+
+    def _put(self, n, factors):
+        self._entries[n] = factors
+        self._entries.move_to_end(n)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, n):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            factors = self._entries.get(n)
+            if factors is not None:
+                self._entries.move_to_end(n)
+            return factors
+
+    def put(self, n, factors, persist=False):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._put(n, factors)
+            if persist and self.path is not None:
+                try:
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.write(_record(n, factors))
+                    self._lines += 1
+                except OSError:
+                    pass
+                if self._lines > 2 * self.maxsize:
+                    self._compact()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cache = FactorCache()
+
+
+def brent(n):
+    if n % 2 == 0:
+        return 2
+
+    rng = random.Random(n)
+    while True:
+        y = rng.randrange(1, n)
+        c = rng.randrange(1, n)
+        m = 128
+        g = r = q = 1
+
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+
+        if g != n:
+            return g
+
+
+def factorize(n):
+    n = int(n)
+    if n < 2:
+        return []
+
+    cached = cache.get(n)
+    if cached is not None:
+        return list(cached)
+
+    factors = []
+    m = n
+    for p in SMALL_PRIMES:
+        if p * p > m:
+            break
+        while m % p == 0:
+            factors.append(p)
+            m //= p
+
+    expensive = False
+    stack = [m] if m > 1 else []
+    while stack:
+        m = stack.pop()
+        if calc_primes.is_prime(m):
+            factors.append(m)
+            continue
+        root = math.isqrt(m)
+        if root * root == m:
+            stack += [root, root]
+            continue
+        expensive = True
+        d = brent(m)
+        stack += [d, m // d]
+
+    factors.sort()
+    cache.put(n, factors, persist=expensive)
+    return list(factors)
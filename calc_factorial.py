@@ -0,0 +1,147 @@
+import math
+import threading
+from decimal import Decimal, localcontext
+
+LIMIT = 10 ** 6
+CHECKPOINT_BYTES = 32 * 2 ** 20
+
+
+def product_range(lo, hi, step=1):
+    # Произведение lo × (lo + step) × ... для чисел < hi, деревом произведений
+    count = len(range(lo, hi, step))
+    if count <= 0:
+        return 1
+    if count <= 16:
+        result = 1
+        for i in range(lo, hi, step):
+            result *= i
+        return result
+    mid = lo + (count // 2) * step
+    return product_range(lo, mid, step) * product_range(mid, hi, step)
+
+
+class CheckpointCache:
+    def __init__(self, max_bytes=CHECKPOINT_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def nearest(self, kind, n):
+        with self._lock:
+            best = None
+            for key_kind, m in self._entries:
+                if key_kind == kind and m <= n and (m - n) % (2 if kind == "double" else 1) == 0:
+                    if best is None or m > best:
+                        best = m
+            if best is None:
+                return None, 1
+            value = self._entries.pop((kind, best))
+            self._entries[(kind, best)] = value
+            return best, value
+
+    def put(self, kind, n, value):
+        nbytes = (value.bit_length() + 7) // 8
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            key = (kind, n)
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                old = next(iter(self._entries))
+                self.size -= (self._entries.pop(old).bit_length() + 7) // 8
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+checkpoints = CheckpointCache()
+
+
+def _check(n):
+    n = int(n)
+    if n < 0:
+        raise ValueError("Факториал отрицательного числа")
+    if n > LIMIT:
+        raise ValueError(f"Слишком большое число (максимум {LIMIT})")
+    return n
+
+
+def factorial(n):
+    n = _check(n)
+    if n < 2:
+        return 1
+
+    m, value = checkpoints.nearest("single", n)
+    if m is None or n - m > n // 4:
+        value = math.factorial(n)
+    elif m < n:
+        value *= product_range(m + 1, n + 1)
+
+    checkpoints.put("single", n, value)
+    return value
+
+
+def double_factorial(n):
+    n = _check(n)
+    if n < 2:
+        return 1
+
+    if n % 2 == 0:
+        value = factorial(n // 2) << (n // 2)
+    else:
+        m, value = checkpoints.nearest("double", n)
+        if m is None:
+            value = product_range(1, n + 1, 2)
+        elif m < n:
+            value *= product_range(m + 2, n + 1, 2)
+
+    checkpoints.put("double", n, value)
+    return value
+
+
+def digit_count(value):
+    return leading_digits(value, 1)[1] + 1
+
+
+def _truncate(value, shift, digits, rounding):
+    with localcontext() as ctx:
+        ctx.prec = digits + 20
+        ctx.rounding = rounding
+        x = Decimal(value) * Decimal(2) ** shift
+        exponent = x.adjusted()
+        mantissa = x.scaleb(-exponent).quantize(Decimal(1).scaleb(1 - digits), rounding='ROUND_DOWN')
+    return str(mantissa).replace('.', ''), exponent
+
+
+def leading_digits(value, digits=20):
+    # Первые цифры и порядок без перевода всего числа в строку
+    value = abs(int(value))
+    if value == 0:
+        return "0", 0
+    shift = max(value.bit_length() - 4 * digits - 64, 0)
+    top = value >> shift
+    low = _truncate(top, shift, digits, 'ROUND_FLOOR')
+    if shift == 0 or _truncate(top + 1, shift, digits, 'ROUND_CEILING') == low:
+        return low
+
+    # Граница между соседними значениями - уточняем точным делением
+    exponent = low[1] + (value >= 10 ** (low[1] + 1))
+    head = value // 10 ** max(exponent - digits + 1, 0)
+    return str(head).ljust(digits, '0')[:digits], exponent
+
+
+def describe(value, digits=20, mode="scientific"):
+    value = int(value)
+    mantissa, exponent = leading_digits(value, digits)
+    sign = "-" if value < 0 else ""
+    if mode == "count":
+        return f"{exponent + 1} цифр"
+    if len(mantissa) > 1:
+        mantissa = mantissa[0] + "." + mantissa[1:]
+    return f"{sign}{mantissa}e+{exponent} ({exponent + 1} цифр)"
@@ -0,0 +1,47 @@
+import math
+import os
+import re
+
+_SEPARATORS = re.compile(r'[\s,;]+')
+
+
+def read_numbers(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            for token in _SEPARATORS.split(line.strip()):
+                if token:
+                    yield int(token)
+
+
+def _is_int_array(values):
+    dtype = getattr(values, 'dtype', None)
+    return dtype is not None and dtype.kind in 'iu'
+
+
+def _numbers(values):
+    if isinstance(values, (str, os.PathLike)):
+        return list(read_numbers(values))
+    if hasattr(values, 'dtype'):
+        return [int(v) for v in values.ravel()]
+    return [int(v) for v in values]
+
+
+def gcd(values):
+    if _is_int_array(values):
+        import numpy as np
+
+        return int(np.gcd.reduce(values.ravel()))
+
+    # math.gcd сам переходит на алгоритм Лемера для длинных чисел
+    return math.gcd(*_numbers(values))
+
+
+def lcm(values):
+    if _is_int_array(values):
+        import numpy as np
+
+        # lcm в int64 переполняется без ошибки, поэтому редукция идёт в int Python
+        values = np.unique(np.abs(values.ravel())).tolist()
+    else:
+        values = set(abs(v) for v in _numbers(values))
+    return math.lcm(*values)
@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+HISTORY_FILE = 'calc_history.jsonl'
+LEGACY_FILE = 'calc_history.json'
+RETENTION = 10000
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 2.0
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_FILE, retention=RETENTION, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, legacy_path=LEGACY_FILE):
+        self.path = path
+        self.retention = retention
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.legacy_path = legacy_path
+        self.last_error = None
+
+        self.entries = deque(maxlen=retention)
+        self._pending = []
+        self._lines = 0
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._version = 0
+        self._search_key = None
+        self._search_result = []
+
+        self.load()
+
+        self._thread = threading.Thread(target=self._run, name='history-journal', daemon=True)
+        self._thread.start()
+
+    def load(self):
+        entries = []
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            continue
+            elif self.legacy_path and os.path.exists(self.legacy_path):
+                with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.last_error = e
+
+        with self._lock:
+            self.entries.clear()
+            self.entries.extend(entries)
+            self._lines = len(entries)
+            self._version += 1
+
+        if entries and not os.path.exists(self.path):
+            self.compact()
+
+    def append(self, entry):
+        entry.setdefault('time', time.time())
+        with self._lock:
+            self.entries.append(entry)
+            self._pending.append(entry)
+            self._version += 1
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.entries)
+
+    def search(self, query='', function=None):
+        # Новейшие записи первыми; уточнение запроса фильтрует прошлый результат
+        query = query.strip().lower()
+        key = (query, function, self._version)
+        if key == self._search_key:
+            return self._search_result
+
+        previous = self._search_key
+        if previous and previous[1:] == key[1:] and query.startswith(previous[0]):
+            candidates = self._search_result
+        else:
+            candidates = reversed(self.snapshot())
+
+        result = [entry for entry in candidates if _matches(entry, query, function)]
+        self._search_key, self._search_result = key, result
+        return result
+
+    def page(self, start, count, query='', function=None):
+        return self.search(query, function)[start:start + count]
+
+    def functions(self):
+        return sorted({entry.get('function', '') for entry in self.snapshot()})
+
+    def __len__(self):
+        return len(self.entries)
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in batch))
+                self._lines += len(batch)
+            except OSError as e:
+                self.last_error = e
+                with self._lock:
+                    self._pending = batch + self._pending
+
+    def compact(self):
+        # Журнал переписывается только последними retention записями
+        with self._io_lock:
+            with self._lock:
+                entries = list(self.entries)
+                pending = self._pending
+                self._pending = []
+
+            tmp_path = self.path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+                os.replace(tmp_path, self.path)
+                self._lines = len(entries)
+            except OSError as e:
+                self.last_error = e
+                with self._lock:
+                    self._pending = pending + self._pending
+
+    def clear(self):
+        with self._io_lock:
+            with self._lock:
+                self.entries.clear()
+                self._pending = []
+                self._version += 1
+            try:
+                open(self.path, 'w', encoding='utf-8').close()
+                self._lines = 0
+            except OSError as e:
+                self.last_error = e
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            if self._lines > 2 * self.retention:
+                self.compact()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self.flush()
+
+
+def _matches(entry, query, function):
+    if function and entry.get('function') != function:
+        return False
+    if not query:
+        return True
+    text = f"{entry.get('function', '')} {' '.join(map(str, entry.get('args', [])))} {entry.get('result', '')}"
+    return query in text.lower()
@@ -0,0 +1,132 @@
+from collections import deque
+
+import numpy as np
+
+import calc_plotcache
+
+COARSE = 32
+DEPTH = 5
+
+
+def _evaluate(F, x, y):
+    with np.errstate(all='ignore'):
+        value = np.asarray(F(x, y), dtype=np.float64)
+    return np.broadcast_to(value, np.broadcast(x, y).shape)
+
+
+def _crossed(values):
+    # Ноль считаем отрицательным, чтобы касание F = 0 в узле сетки тоже давало пересечение
+    negative = values <= 0
+    return negative.any(axis=1) & ~negative.all(axis=1) & np.isfinite(values).all(axis=1)
+
+
+def _corners(F, i, j, x_min, y_min, size):
+    # Координаты узлов считаются из целых индексов, чтобы у соседних ячеек они совпадали побитово
+    xs = x_min + np.stack([i, i + 1, i + 1, i], axis=1) * size
+    ys = y_min + np.stack([j, j, j + 1, j + 1], axis=1) * size
+    return xs, ys, _evaluate(F, xs, ys)
+
+
+def _edge_points(xa, ya, fa, xb, yb, fb):
+    with np.errstate(all='ignore'):
+        t = np.clip(fa / (fa - fb), 0, 1)
+    return xa + (xb - xa) * t, ya + (yb - ya) * t
+
+
+def _segments(F, xs, ys, values):
+    # Рёбра ориентированы от меньшей координаты к большей, поэтому у соседних ячеек точки совпадают
+    edges = [(0, 1), (1, 2), (3, 2), (0, 3)]
+    negative = values <= 0
+    crossing = np.stack([negative[:, a] != negative[:, b] for a, b in edges], axis=1)
+    px = np.empty(crossing.shape)
+    py = np.empty(crossing.shape)
+    for i, (a, b) in enumerate(edges):
+        px[:, i], py[:, i] = _edge_points(xs[:, a], ys[:, a], values[:, a], xs[:, b], ys[:, b], values[:, b])
+
+    segments = []
+    count = crossing.sum(axis=1)
+
+    simple = np.flatnonzero(count == 2)
+    if len(simple):
+        order = np.argsort(~crossing[simple], axis=1, kind='stable')[:, :2]
+        rows = simple[:, None]
+        segments.append(np.stack([px[rows, order], py[rows, order]], axis=2))
+
+    saddle = np.flatnonzero(count == 4)
+    if len(saddle):
+        center = _evaluate(F, xs[saddle].mean(axis=1), ys[saddle].mean(axis=1)) <= 0
+        joined = center == negative[saddle, 0]
+        pairs = np.where(joined[:, None, None], [[0, 1], [2, 3]], [[3, 0], [1, 2]])
+        rows = saddle[:, None]
+        for k in range(2):
+            order = pairs[:, k, :]
+            segments.append(np.stack([px[rows, order], py[rows, order]], axis=2))
+
+    if not segments:
+        return np.empty((0, 2, 2))
+    return np.concatenate(segments)
+
+
+def _join(segments):
+    # Склейка отрезков в ломаные по общим концам
+    keys = [(tuple(a), tuple(b)) for a, b in segments.tolist()]
+    neighbours = {}
+    for index, (a, b) in enumerate(keys):
+        neighbours.setdefault(a, []).append(index)
+        neighbours.setdefault(b, []).append(index)
+
+    used = [False] * len(keys)
+    polylines = []
+    for start in range(len(keys)):
+        if used[start]:
+            continue
+        used[start] = True
+        chain = deque(keys[start])
+        for forward in (True, False):
+            end = chain[-1] if forward else chain[0]
+            while True:
+                following = [i for i in neighbours[end] if not used[i]]
+                if not following:
+                    break
+                index = following[0]
+                used[index] = True
+                a, b = keys[index]
+                end = b if a == end else a
+                if forward:
+                    chain.append(end)
+                else:
+                    chain.appendleft(end)
+        points = np.array(chain)
+        polylines.append((points[:, 0], points[:, 1]))
+    return polylines
+
+
+def trace(F, xlim, ylim, coarse=COARSE, depth=DEPTH):
+    x_min, x_max = sorted(xlim)
+    y_min, y_max = sorted(ylim)
+    size = max(x_max - x_min, y_max - y_min) / coarse
+    if not size > 0:
+        return []
+
+    nx = int(np.ceil((x_max - x_min) / size - 1e-9))
+    ny = int(np.ceil((y_max - y_min) / size - 1e-9))
+    i, j = calc_plotcache.index_grid(nx, ny)
+
+    # Квадродерево: делим только ячейки, через которые проходит кривая
+    for level in range(depth + 1):
+        xs, ys, values = _corners(F, i, j, x_min, y_min, size)
+        crossed = _crossed(values)
+        i, j = i[crossed], j[crossed]
+        if level == depth:
+            xs, ys, values = xs[crossed], ys[crossed], values[crossed]
+            break
+        size /= 2
+        i = np.concatenate([2 * i, 2 * i + 1, 2 * i, 2 * i + 1])
+        j = np.concatenate([2 * j, 2 * j, 2 * j + 1, 2 * j + 1])
+
+    return _join(_segments(F, xs, ys, values))
+
+
+def curve(key, F, xlim, ylim, coarse=COARSE, depth=DEPTH):
+    cache_key = ('implicit', key, tuple(xlim), tuple(ylim), coarse, depth)
+    return calc_plotcache.cache.fetch(cache_key, lambda: trace(F, xlim, ylim, coarse, depth))
@@ -0,0 +1,102 @@
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque
+
+WINDOW = 1000
+PERCENTILES = (50, 95, 99)
+
+
+def result_size(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return (value.bit_length() + 7) // 8
+    return sys.getsizeof(value)
+
+
+def percentile(values, q):
+    # Ближайший ранг по отсортированному окну
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered), math.ceil(q / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+class OperationStats:
+    def __init__(self, window=WINDOW):
+        self.count = 0
+        self.errors = {}
+        self.wall = deque(maxlen=window)
+        self.cpu = deque(maxlen=window)
+        self.size = deque(maxlen=window)
+
+    def summary(self):
+        result = {'count': self.count, 'errors': dict(self.errors)}
+        for name, values in (('wall', self.wall), ('cpu', self.cpu), ('size', self.size)):
+            result[name] = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+        return result
+
+
+class Metrics:
+    # Скользящие окна последних замеров по каждой операции
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.started = time.time()
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, wall, cpu=None, result=None, error=None):
+        # Запись без блокировки: append у deque атомарен, а счётчики - только для отображения
+        stats = self._operations.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._operations.setdefault(name, OperationStats(self.window))
+        stats.count += 1
+        stats.wall.append(wall)
+        if cpu is not None:
+            stats.cpu.append(cpu)
+        if error is not None:
+            kind = type(error).__name__
+            stats.errors[kind] = stats.errors.get(kind, 0) + 1
+        else:
+            stats.size.append(result_size(result))
+
+    def summary(self):
+        with self._lock:
+            operations = sorted(self._operations.items())
+        return {name: stats.summary() for name, stats in operations}
+
+    def export(self, path):
+        data = {
+            'started': self.started,
+            'exported': time.time(),
+            'window': self.window,
+            'operations': self.summary()
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def clear(self):
+        with self._lock:
+            self._operations.clear()
+            self.started = time.time()
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("с", 1), ("мс", 1e-3), ("мкс", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.0f} нс"
+
+
+def format_size(size):
+    if size is None:
+        return "-"
+    for unit, scale in (("МБ", 2 ** 20), ("КБ", 2 ** 10)):
+        if size >= scale:
+            return f"{size / scale:.3g} {unit}"
+    return f"{size} Б"
@@ -0,0 +1,112 @@
+import heapq
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from calc_precision import Precision
+
+CHUNKS_PER_WORKER = 4
+INLINE_COST = 10 ** 5
+
+_engine = None
+
+
+def _bits(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 1
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return 1
+        value = int(value)
+    return max(abs(value).bit_length(), 1)
+
+
+def estimate(name, args):
+    # Грубая оценка стоимости по длине входа: нужна только для раскладки по процессам
+    bits = max((_bits(a) for a in args), default=1)
+    if name in ("factorial", "double_fact"):
+        n = abs(int(args[0])) if args and _bits(args[0]) < 64 else 2 ** 20
+        return n * max(n.bit_length(), 1)
+    if name == "prime_factors":
+        return 2 ** min(bits // 4, 60)
+    if name == "is_prime":
+        return bits ** 3
+    if name == "power" and len(args) == 2 and isinstance(args[1], int) and args[1] > 0:
+        # Стоимость растёт с длиной результата: около bits(a) × b бит
+        return _bits(args[0]) * min(args[1], 2 ** 40)
+    if name in ("gcd", "lcm", "power"):
+        return bits * len(args)
+    return bits
+
+
+def _init(precision):
+    global _engine
+    from calc_engine import CalcEngine
+
+    _engine = CalcEngine(precision=Precision(*precision))
+
+
+def _run_chunk(chunk):
+    results = []
+    for index, name, args in chunk:
+        try:
+            results.append((index, True, _engine.evaluate(name, *args)))
+        except Exception as e:
+            results.append((index, False, e))
+    return results
+
+
+def split(tasks, count):
+    # Самые дорогие задачи первыми, каждая - в наименее загруженную пачку
+    costs = sorted(((estimate(name, args), index) for index, (name, args) in enumerate(tasks)), reverse=True)
+    bins = [(0, i, []) for i in range(min(count, len(tasks)))]
+    heapq.heapify(bins)
+    for cost, index in costs:
+        total, i, chunk = heapq.heappop(bins)
+        chunk.append((index, *tasks[index]))
+        heapq.heappush(bins, (total + cost, i, chunk))
+    return [chunk for total, i, chunk in sorted(bins, reverse=True) if chunk]
+
+
+class ParallelEvaluator:
+    def __init__(self, workers=None, chunks_per_worker=CHUNKS_PER_WORKER, precision=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self.precision = (precision or Precision()).key
+        self.executor = None
+
+    def start(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_init, initargs=(self.precision,))
+        return self.executor
+
+    def map(self, tasks):
+        # Результаты в исходном порядке: (True, значение) или (False, исключение)
+        tasks = [(name, tuple(args)) for name, args in tasks]
+        results = [None] * len(tasks)
+
+        if self.workers == 1 or sum(estimate(name, args) for name, args in tasks) < INLINE_COST:
+            if _engine is None or _engine.precision.key != self.precision:
+                _init(self.precision)
+            chunks = [_run_chunk([(index, *task) for index, task in enumerate(tasks)])]
+        else:
+            executor = self.start()
+            futures = [executor.submit(_run_chunk, chunk)
+                       for chunk in split(tasks, self.workers * self.chunks_per_worker)]
+            chunks = (future.result() for future in futures)
+
+        for chunk in chunks:
+            for index, success, value in chunk:
+                results[index] = (success, value)
+        return results
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,163 @@
+import tkinter as tk
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from calc_sampling import VIEW
+
+ZOOM_STEP = 1.25
+# Пределы масштаба: дальше не хватает точности float или график теряет смысл
+MIN_SPAN = 1e-6
+MAX_SPAN = 1e6
+
+
+class PlotView:
+    def __init__(self, figure=None):
+        self.figure = figure or Figure(figsize=(5, 5), dpi=80)
+        self.axes = self.figure.add_subplot()
+        self.canvas = None
+        self.background = None
+        self.limits = None
+        self.lines = []
+        self.on_view = None
+        self.drag = None
+        # Запрошенный, но ещё не показанный вид: колесо быстрее перерисовки
+        self.pending = None
+
+        self.draw_static()
+        self.title = self.axes.set_title('', fontsize=14, animated=True)
+
+    def draw_static(self):
+        axes = self.axes
+        axes.axhline(y=0, color='black', linestyle='-', linewidth=2.5)
+        axes.axvline(x=0, color='black', linestyle='-', linewidth=2.5)
+
+        # Стрелки и подписи осей привязаны к краю области, а не к координате 10
+        axes.plot(1, 0, '>k', markersize=8, transform=axes.get_yaxis_transform(), clip_on=False)
+        axes.plot(0, 1, '^k', markersize=8, transform=axes.get_xaxis_transform(), clip_on=False)
+        axes.text(0.97, -0.04, 'X', fontsize=14, fontweight='bold', color='black',
+                  transform=axes.get_yaxis_transform(), ha='right', va='top')
+        axes.text(-0.04, 0.97, 'Y', fontsize=14, fontweight='bold', color='black',
+                  transform=axes.get_xaxis_transform(), ha='right', va='top')
+
+        axes.grid(True, alpha=0.3)
+        axes.legend(handles=[
+            Line2D([], [], color='b', linewidth=3, label='График'),
+            Line2D([], [], color='black', linewidth=2.5, label='Ось Х'),
+            Line2D([], [], color='black', linewidth=2.5, label='Ось Y')
+        ], loc='upper right')
+
+    def attach(self, canvas):
+        self.canvas = canvas
+        canvas.mpl_connect('draw_event', self.on_draw)
+        canvas.mpl_connect('scroll_event', self.on_scroll)
+        canvas.mpl_connect('button_press_event', self.on_press)
+        canvas.mpl_connect('motion_notify_event', self.on_motion)
+        canvas.mpl_connect('button_release_event', self.on_release)
+
+    def navigate(self, xlim, ylim):
+        # Сам вид не меняем: вызывающий пересчитает график для новой области и вызовет show
+        if self.on_view is not None and self.limits is not None:
+            if xlim is not None:
+                xlim, ylim = tuple(map(float, xlim)), tuple(map(float, ylim))
+            self.pending = (xlim, ylim) if xlim is not None else None
+            self.on_view(xlim, ylim)
+
+    def on_scroll(self, event):
+        if event.inaxes is not self.axes or self.limits is None:
+            return
+        scale = 1 / ZOOM_STEP if event.button == 'up' else ZOOM_STEP
+        (x_min, x_max), (y_min, y_max) = self.pending or self.limits
+        if not MIN_SPAN <= (x_max - x_min) * scale <= MAX_SPAN:
+            return
+
+        # Точка под курсором остаётся на месте
+        x, y = event.xdata, event.ydata
+        self.navigate(
+            (x - (x - x_min) * scale, x + (x_max - x) * scale),
+            (y - (y - y_min) * scale, y + (y_max - y) * scale)
+        )
+
+    def on_press(self, event):
+        if event.inaxes is not self.axes or event.button != 1:
+            return
+        if event.dblclick:
+            self.drag = None
+            self.navigate(None, None)
+            return
+        # Преобразование запоминаем на момент нажатия: во время сдвига пределы меняются
+        self.drag = (self.axes.transData.inverted(), event.x, event.y, self.pending or self.limits)
+
+    def on_motion(self, event):
+        if self.drag is None or event.x is None:
+            return
+        transform, x, y, ((x_min, x_max), (y_min, y_max)) = self.drag
+        (x0, y0), (x1, y1) = transform.transform([(x, y), (event.x, event.y)])
+        dx, dy = x0 - x1, y0 - y1
+        self.navigate((x_min + dx, x_max + dx), (y_min + dy, y_max + dy))
+
+    def on_release(self, event):
+        self.drag = None
+
+    def on_draw(self, event):
+        # Полная перерисовка: запоминаем статичный фон без графика и заголовка
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_dynamic()
+
+    def draw_dynamic(self):
+        for line in self.lines:
+            if line.get_visible():
+                self.axes.draw_artist(line)
+        self.figure.draw_artist(self.title)
+
+    def show(self, curves, title, xlim=VIEW, ylim=VIEW, color='b'):
+        while len(self.lines) < len(curves):
+            line, = self.axes.plot([], [], '-', linewidth=3, animated=True)
+            self.lines.append(line)
+
+        for i, line in enumerate(self.lines):
+            if i < len(curves):
+                line.set_data(*curves[i])
+                line.set_color(color)
+                line.set_visible(True)
+            else:
+                line.set_visible(False)
+
+        self.title.set_text(title)
+
+        limits = (tuple(xlim), tuple(ylim))
+        self.pending = None
+        if limits != self.limits:
+            self.limits = limits
+            self.axes.set_xlim(*xlim)
+            self.axes.set_ylim(*ylim)
+            self.background = None
+
+        self.redraw()
+
+    def redraw(self):
+        if self.canvas is None:
+            return
+        if self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self.draw_dynamic()
+        self.canvas.blit(self.figure.bbox)
+
+
+class PlotPanel(tk.Frame):
+    def __init__(self, parent, bg):
+        super().__init__(parent, bg=bg)
+        self.view = PlotView()
+        self.canvas = FigureCanvasTkAgg(self.view.figure, master=self)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.view.attach(self.canvas)
+
+    def show(self, curves, title, xlim=VIEW, ylim=VIEW, color='b'):
+        self.view.show(curves, title, xlim, ylim, color)
+
+    def bind_view(self, callback):
+        # callback(xlim, ylim) при сдвиге и масштабе, callback(None, None) - вернуть исходный вид
+        self.view.on_view = callback
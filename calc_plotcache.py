@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+CACHE_BYTES = 32 * 2 ** 20
+GRID_CACHE_SIZE = 32
+# Узел OrderedDict, ключ и кортежи вокруг массивов
+ENTRY_OVERHEAD = 400
+
+
+def footprint(data):
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, (tuple, list)):
+        return sum(footprint(item) for item in data) + 8 * len(data)
+    return 0
+
+
+def _freeze(data):
+    # Кэшированные массивы отдаются нескольким графикам, поэтому запрещаем их изменение
+    if isinstance(data, np.ndarray):
+        data.flags.writeable = False
+    elif isinstance(data, (tuple, list)):
+        for item in data:
+            _freeze(item)
+    return data
+
+
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def grid(start, stop, count):
+    # Одна и та же сетка x нужна всем графикам с одинаковой областью
+    return _freeze(np.linspace(start, stop, count))
+
+
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def index_grid(nx, ny):
+    i, j = np.meshgrid(np.arange(nx), np.arange(ny))
+    return _freeze(i.ravel()), _freeze(j.ravel())
+
+
+class PlotCache:
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, data):
+        nbytes = footprint(data) + ENTRY_OVERHEAD
+        if nbytes > self.max_bytes:
+            return data
+        _freeze(data)
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (data, nbytes)
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                self.size -= self._entries.popitem(last=False)[1][1]
+        return data
+
+    def fetch(self, key, compute):
+        data = self.get(key)
+        if data is None:
+            data = self.put(key, compute())
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+cache = PlotCache()
@@ -0,0 +1,137 @@
+import math
+from contextlib import nullcontext
+from decimal import MAX_EMAX, MIN_EMIN, Context, Decimal, localcontext
+from fractions import Fraction
+
+import calc_expr
+
+MODES = ("float", "decimal", "fraction")
+DIGITS = 50
+MAX_DIGITS = 10000
+
+
+class Precision:
+    def __init__(self, mode="float", digits=DIGITS):
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим точности: {mode}")
+        digits = int(digits)
+        if not 1 <= digits <= MAX_DIGITS:
+            raise ValueError(f"Число знаков должно быть от 1 до {MAX_DIGITS}")
+        self.mode = mode
+        self.digits = digits
+        self.context = Context(prec=digits, Emax=MAX_EMAX, Emin=MIN_EMIN)
+        self._constants = {}
+
+    @property
+    def exact(self):
+        return self.mode != "float"
+
+    @property
+    def key(self):
+        return self.mode, self.digits
+
+    def scope(self):
+        # Операторы Decimal берут точность из контекста потока, поэтому вычисления идут внутри него
+        if self.mode == "decimal":
+            return localcontext(self.context)
+        return nullcontext()
+
+    def number(self, text):
+        if self.mode == "decimal":
+            return self.context.create_decimal(text)
+        if self.mode == "fraction":
+            return Fraction(text)
+        return float(text)
+
+    def real(self, value):
+        if self.mode == "decimal" and isinstance(value, float):
+            return self.to_decimal(value)
+        return value
+
+    def to_decimal(self, value):
+        # float - это уже приближение, поэтому берём только его надёжные 15 знаков
+        if isinstance(value, float):
+            return self.context.create_decimal(f"{value:.15g}")
+        if isinstance(value, Fraction):
+            return self.context.divide(Decimal(value.numerator), Decimal(value.denominator))
+        return Decimal(value)
+
+    def divide(self, a, b):
+        if self.mode == "decimal":
+            return self.context.divide(self.to_decimal(a), self.to_decimal(b))
+        if self.mode == "fraction" and not isinstance(a, float) and not isinstance(b, float):
+            return _simplify(Fraction(a) / Fraction(b))
+        return a / b
+
+    def power(self, a, b, max_bits=calc_expr.MAX_POWER_BITS):
+        if not self.exact or (isinstance(a, int) and isinstance(b, int) and b >= 0):
+            return calc_expr.safe_power(a, b, max_bits)
+
+        if self.mode == "decimal":
+            # Дробная степень в Decimal дорожает быстрее квадрата числа знаков: 4000 знаков - секунды
+            a, b = self.to_decimal(a), self.to_decimal(b)
+            if b != b.to_integral_value() and self.digits ** 2 > 4 * max_bits:
+                raise calc_expr.NumberTooLarge("Слишком много знаков для дробной степени")
+            return self.context.power(a, b)
+
+        if isinstance(a, float) or isinstance(b, float) or Fraction(b).denominator != 1:
+            return float(a) ** float(b)
+        a, b = Fraction(a), int(b)
+        if abs(b) * max(a.numerator.bit_length(), a.denominator.bit_length()) > max_bits:
+            raise calc_expr.NumberTooLarge("Слишком большое число")
+        return _simplify(a ** b)
+
+    def sqrt(self, x):
+        if self.mode == "decimal":
+            return self.context.sqrt(self.to_decimal(x))
+        if self.mode == "fraction" and not isinstance(x, float):
+            # Точный корень, если числитель и знаменатель - полные квадраты
+            x = Fraction(x)
+            numerator, denominator = math.isqrt(x.numerator), math.isqrt(x.denominator)
+            if numerator * numerator == x.numerator and denominator * denominator == x.denominator:
+                return _simplify(Fraction(numerator, denominator))
+        return math.sqrt(x)
+
+    def log(self, a, base):
+        if self.mode == "decimal":
+            # Запасные знаки, чтобы log(2, 8) округлялся ровно в 3
+            context = self.context.copy()
+            context.prec += 5
+            result = context.divide(context.ln(self.to_decimal(a)), context.ln(self.to_decimal(base)))
+            return self.context.plus(result)
+        return math.log(a, base)
+
+    def constants(self, names=None, max_bits=calc_expr.MAX_POWER_BITS):
+        if self.mode != "decimal":
+            return calc_expr.CONSTANTS
+        # Считаются только нужные выражению константы: pi на 10000 знаков - это секунды
+        missing = [name for name in (calc_expr.CONSTANTS if names is None else names) if name not in self._constants]
+        if missing and self.digits ** 2 > 4 * max_bits:
+            raise calc_expr.NumberTooLarge("Слишком много знаков для константы")
+        with localcontext(self.context):
+            for name in missing:
+                if name in ('pi', 'π', 'tau') and 'pi' not in self._constants:
+                    self._constants['pi'] = self._constants['π'] = _pi()
+                    self._constants['tau'] = 2 * self._constants['pi']
+                elif name == 'e':
+                    self._constants['e'] = Decimal(1).exp()
+        return self._constants
+
+
+def _pi():
+    # Ряд из документации модуля decimal, считается в текущем контексте
+    with localcontext() as ctx:
+        ctx.prec += 2
+        three = Decimal(3)
+        lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+    return +s
+
+
+def _simplify(value):
+    return value.numerator if value.denominator == 1 else value
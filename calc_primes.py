@@ -0,0 +1,192 @@
+import math
+import threading
+
+SIEVE_LIMIT = 1 << 24
+SIEVE_START = 1 << 16
+
+# Детерминированный набор свидетелей для n < 3.3 × 10^24
+WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+WITNESSES_LIMIT = 3317044064679887385961981
+
+_TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+
+
+class PrimeSieve:
+    def __init__(self, limit=SIEVE_START, max_limit=SIEVE_LIMIT):
+        self.max_limit = max_limit
+        self._lock = threading.Lock()
+        self._state = (1, b'')
+        self.grow(limit)
+
+    @property
+    def limit(self):
+        return self._state[0]
+
+    def grow(self, n):
+        if n <= self._state[0]:
+            return
+        with self._lock:
+            limit = self._state[0]
+            if n <= limit:
+                return
+            limit = min(max(n, 2 * limit), self.max_limit)
+
+            # Байт на каждое нечётное число: flags[i] относится к 2i + 1
+            size = limit // 2 + 1
+            flags = bytearray(b'\x01') * size
+            flags[0] = 0
+            i = 1
+            while (2 * i + 1) ** 2 <= limit:
+                if flags[i]:
+                    p = 2 * i + 1
+                    start = p * p // 2
+                    flags[start::p] = bytes(len(range(start, size, p)))
+                i += 1
+
+            # Упаковка в биты: бит i установлен, если 2i + 1 простое
+            bits = int(flags.translate(_TO_ASCII)[::-1], 2)
+            self._state = (limit, bits.to_bytes((size + 7) // 8, 'little'))
+
+    def __contains__(self, n):
+        limit, bits = self._state
+        if n == 2:
+            return True
+        if n < 2 or n % 2 == 0 or n > limit:
+            return False
+        i = n >> 1
+        return bool(bits[i >> 3] >> (i & 7) & 1)
+
+    def primes(self, limit=None):
+        if limit is not None:
+            self.grow(limit)
+        sieve_limit, bits = self._state
+        if limit is None:
+            limit = sieve_limit
+        if limit >= 2:
+            yield 2
+        for byte_index, byte in enumerate(bits):
+            while byte:
+                low = byte & -byte
+                p = 2 * (byte_index * 8 + low.bit_length() - 1) + 1
+                if p > limit:
+                    return
+                yield p
+                byte ^= low
+
+
+def jacobi(a, n):
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _half(x, n):
+    x %= n
+    return (x + n if x % 2 else x) // 2
+
+
+def strong_lucas(n):
+    # Сильный тест Люка с параметрами Селфриджа: P = 1, D - первое из 5, -7, 9, ... с (D/n) = -1
+    root = math.isqrt(n)
+    if root * root == n:
+        return False
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    Q = (1 - D) // 4
+
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # U_k, V_k и Q^k по двоичной записи d, начиная с k = 1
+    U, V, Qk = 1, 1, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = _half(U + V, n), _half(D * U + V, n)
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def miller_rabin(n):
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in WITNESSES:
+        if a % n == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+sieve = PrimeSieve()
+
+
+def is_prime(n):
+    n = int(n)
+    if n < 2:
+        return False
+    if n <= sieve.max_limit:
+        sieve.grow(n)
+        return n in sieve
+    for p in WITNESSES:
+        if n % p == 0:
+            return False
+    if n < WITNESSES_LIMIT:
+        return miller_rabin(n)
+    # Выше границы свидетели уже не гарантируют ответ: добавляем тест Люка (BPSW)
+    return miller_rabin(n) and strong_lucas(n)
+
+
+def is_prime_many(numbers):
+    numbers = [int(n) for n in numbers]
+    small = [n for n in numbers if n <= sieve.max_limit]
+    if small:
+        sieve.grow(max(small))
+
+    result = []
+    for n in numbers:
+        if n < 2:
+            result.append(False)
+        elif n <= sieve.max_limit:
+            result.append(n in sieve)
+        else:
+            result.append(is_prime(n))
+    return result
@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+
+import calc_plotcache
+
+VIEW = (-11, 11)
+INITIAL_POINTS = 64
+MAX_DEPTH = 10
+TOLERANCE = 0.002
+# Плиток на ширину видимой области
+TILES = 4
+
+
+def _evaluate(f, x):
+    with np.errstate(all='ignore'):
+        y = np.asarray(f(x), dtype=np.float64)
+    return np.broadcast_to(y, x.shape).copy()
+
+
+def sample(f, xlim=VIEW, ylim=VIEW, initial=INITIAL_POINTS, max_depth=MAX_DEPTH, tolerance=TOLERANCE):
+    x_min, x_max = xlim
+    y_min, y_max = ylim
+    height = y_max - y_min
+
+    x = calc_plotcache.grid(x_min, x_max, initial + 1)
+    y = _evaluate(f, x)
+    active = np.ones(initial, dtype=bool)
+    poles = np.zeros(initial, dtype=bool)
+
+    for depth in range(max_depth + 1):
+        if not active.any():
+            break
+
+        index = np.flatnonzero(active)
+        x0, x1 = x[index], x[index + 1]
+        y0, y1 = y[index], y[index + 1]
+        xm = (x0 + x1) / 2
+        ym = _evaluate(f, xm)
+
+        finite = np.isfinite(y0) & np.isfinite(y1) & np.isfinite(ym)
+        low, high = np.minimum(y0, y1), np.maximum(y0, y1)
+
+        # Интервалы целиком выше или ниже области видимости не уточняем
+        hidden = ((low > y_max) & (ym > y_max)) | ((high < y_min) & (ym < y_min))
+        bent = np.abs(ym - (y0 + y1) / 2) > tolerance * height
+        refine = ~hidden & (bent | ~finite)
+
+        if depth == max_depth:
+            # Середина вне отрезка [y0, y1] при большом скачке - это полюс, а не крутой участок
+            jump = ~finite | ((high - low > height) & ((ym < low) | (ym > high)))
+            poles[index[refine & jump]] = True
+            break
+
+        split = index[refine]
+        x = np.insert(x, split + 1, xm[refine])
+        y = np.insert(y, split + 1, ym[refine])
+
+        # Новые индексы интервалов: каждый разбитый интервал даёт две половины
+        shift = np.zeros(len(active), dtype=np.int64)
+        shift[split] = 1
+        offset = np.concatenate(([0], np.cumsum(shift)[:-1]))
+        positions = np.arange(len(active)) + offset
+
+        active = np.zeros(len(active) + len(split), dtype=bool)
+        active[positions[split]] = True
+        active[positions[split] + 1] = True
+        old_poles = poles
+        poles = np.zeros(len(active), dtype=bool)
+        poles[positions] = old_poles
+
+    if poles.any():
+        # Разрыв линии: NaN между концами интервала с полюсом
+        split = np.flatnonzero(poles)
+        x = np.insert(x, split + 1, np.nan)
+        y = np.insert(y, split + 1, np.nan)
+
+    return x, y
+
+
+def _tiles(lo, hi, levels):
+    # Ширина плитки - степень двойки: при панорамировании границы плиток не сдвигаются
+    level = math.floor(math.log2((hi - lo) / levels))
+    size = 2.0 ** level
+    return level, size, range(math.floor(lo / size), math.ceil(hi / size))
+
+
+def curve(key, f, xlim=VIEW, ylim=VIEW, initial=INITIAL_POINTS, max_depth=MAX_DEPTH, tolerance=TOLERANCE):
+    # key - тип графика и коэффициенты: по нему f не вызывается, если кривая уже посчитана.
+    # Область x режется на плитки, поэтому после сдвига или отдаления считаются только новые плитки
+    level, size, tiles = _tiles(*xlim, TILES)
+    points = max(initial // TILES, 2)
+
+    # По y берём полосу с запасом в одну высоту: мелкий вертикальный сдвиг не меняет ключ
+    y_level, band, rows = _tiles(*ylim, 1)
+    y_min, y_max = (rows.start - 1) * band, (rows.stop + 1) * band
+    y_tolerance = tolerance * band / (y_max - y_min)
+
+    parts = []
+    for i in tiles:
+        cache_key = ('sample', key, level, i, y_level, rows.start, rows.stop, points, max_depth, tolerance)
+        parts.append(calc_plotcache.cache.fetch(cache_key, lambda: sample(
+            f, (i * size, (i + 1) * size), (y_min, y_max), points, max_depth, y_tolerance
+        )))
+    x = np.concatenate([part[0] for part in parts])
+    y = np.concatenate([part[1] for part in parts])
+    return x, y
@@ -0,0 +1,221 @@
+import numpy as np
+
+ZERO_DIVISION = "Деление на ноль"
+NEGATIVE_SQRT = "Корень из отрицательного числа"
+BAD_LOG_BASE = "Основание должно быть >0 и ≠1"
+BAD_LOG_ARG = "Аргумент должен быть >0"
+CALC_ERROR = "Ошибка вычисления"
+INFINITE_SOLUTIONS = "Бесконечно решений"
+NO_SOLUTIONS = "Нет решений"
+
+
+class BatchResult:
+    def __init__(self, values, errors=None):
+        self.values = values
+        self.errors = errors or {}
+
+    @property
+    def mask(self):
+        mask = np.zeros(np.shape(self.values), dtype=bool)
+        for error_mask in self.errors.values():
+            mask |= error_mask
+        return mask
+
+    def __iter__(self):
+        return iter((self.values, self.mask))
+
+
+def _column(x):
+    return np.array(x, dtype=np.float64, ndmin=1)
+
+
+def _fail(values, errors, message, mask):
+    if mask.any():
+        values[mask] = np.nan
+        errors[message] = errors[message] | mask if message in errors else mask
+    return values
+
+
+def add(a, b):
+    return BatchResult(_column(a) + _column(b))
+
+
+def subtract(a, b):
+    return BatchResult(_column(a) - _column(b))
+
+
+def multiply(a, b):
+    return BatchResult(_column(a) * _column(b))
+
+
+def divide(a, b):
+    a, b = np.broadcast_arrays(_column(a), _column(b))
+    zero = b == 0
+    values = np.divide(a, b, out=np.full(a.shape, np.nan), where=~zero)
+    errors = {}
+    _fail(values, errors, ZERO_DIVISION, zero)
+    return BatchResult(values, errors)
+
+
+def power(a, b):
+    a, b = np.broadcast_arrays(_column(a), _column(b))
+    with np.errstate(all='ignore'):
+        values = np.power(a, b)
+    errors = {}
+    zero = (a == 0) & (b < 0)
+    _fail(values, errors, ZERO_DIVISION, zero)
+    _fail(values, errors, CALC_ERROR, ~zero & ~np.isfinite(values) & np.isfinite(a) & np.isfinite(b))
+    return BatchResult(values, errors)
+
+
+def sqrt(x):
+    x = _column(x)
+    negative = x < 0
+    with np.errstate(invalid='ignore'):
+        values = np.sqrt(x)
+    errors = {}
+    _fail(values, errors, NEGATIVE_SQRT, negative)
+    return BatchResult(values, errors)
+
+
+def sin(a):
+    return BatchResult(np.sin(np.radians(_column(a))))
+
+
+def cos(a):
+    return BatchResult(np.cos(np.radians(_column(a))))
+
+
+def tan(a):
+    a = _column(a)
+    pole = (a - 90) % 180 == 0
+    zero = a % 180 == 0
+    values = np.tan(np.radians(a))
+    values[zero] = 0
+    errors = {}
+    _fail(values, errors, ZERO_DIVISION, pole)
+    return BatchResult(values, errors)
+
+
+def ctg(a):
+    a = _column(a)
+    pole = a % 180 == 0
+    zero = (a - 90) % 180 == 0
+    with np.errstate(divide='ignore'):
+        values = 1 / np.tan(np.radians(a))
+    values[zero] = 0
+    errors = {}
+    _fail(values, errors, ZERO_DIVISION, pole)
+    return BatchResult(values, errors)
+
+
+def deg_to_rad(deg):
+    return BatchResult(np.radians(_column(deg)))
+
+
+def rad_to_deg(rad):
+    return BatchResult(np.degrees(_column(rad)))
+
+
+def logarithm(base, a):
+    base, a = np.broadcast_arrays(_column(base), _column(a))
+    bad_base = (base <= 0) | (base == 1)
+    bad_arg = ~bad_base & (a <= 0)
+    ok = ~(bad_base | bad_arg)
+    values = np.full(base.shape, np.nan)
+    np.divide(np.log(a, where=ok, out=np.full(a.shape, np.nan)),
+              np.log(base, where=ok, out=np.ones(base.shape)),
+              out=values, where=ok)
+    errors = {}
+    _fail(values, errors, BAD_LOG_BASE, bad_base)
+    _fail(values, errors, BAD_LOG_ARG, bad_arg)
+    return BatchResult(values, errors)
+
+
+def integer(x):
+    return BatchResult(np.floor(_column(x)))
+
+
+def fractional(x):
+    x = _column(x)
+    return BatchResult(x - np.floor(x))
+
+
+def _quadratic(a, b, c):
+    # Устойчивая формула: q без вычитания близких чисел, второй корень через c / q
+    root = np.sqrt(b * b - 4 * a * c)
+    sign = np.where((b.real * root.real + b.imag * root.imag) >= 0, 1, -1)
+    q = -(b + sign * root) / 2
+    zero = q == 0
+    q_safe = np.where(zero, 1, q)
+    # q = 0 только при b = c = 0: оба корня нулевые
+    return np.stack([np.where(zero, 0, q / a), np.where(zero, 0, c / q_safe)], axis=1)
+
+
+def roots(coefficients):
+    # Строка - коэффициенты от старшей степени к младшей; результат дополняется NaN до степени
+    coefficients = np.array(coefficients, dtype=np.complex128, ndmin=2)
+    count, size = coefficients.shape
+    degree = size - 1
+    values = np.full((count, max(degree, 1)), np.nan, dtype=np.complex128)
+    errors = {}
+
+    real = not coefficients.imag.any()
+    nonzero = coefficients != 0
+    leading = np.where(nonzero.any(axis=1), nonzero.argmax(axis=1), size)
+    effective = degree - leading
+
+    for d in np.unique(effective):
+        rows = np.flatnonzero(effective == d)
+        if d < 1:
+            continue
+        c = coefficients[rows, degree - d:]
+        if d == 1:
+            values[rows, 0] = -c[:, 1] / c[:, 0]
+        elif d == 2:
+            values[rows, :2] = _quadratic(c[:, 0], c[:, 1], c[:, 2])
+        else:
+            # Собственные числа сопровождающей матрицы, одним вызовом на все строки этой степени;
+            # для вещественных коэффициентов вещественная матрица считается вдвое быстрее
+            if real:
+                c = c.real
+            companion = np.zeros((len(rows), d, d), dtype=c.dtype)
+            companion[:, 0, :] = -c[:, 1:] / c[:, :1]
+            companion[:, np.arange(1, d), np.arange(d - 1)] = 1
+            values[rows, :d] = np.linalg.eigvals(companion)
+
+    for message, mask in ((INFINITE_SOLUTIONS, effective < 0), (NO_SOLUTIONS, effective == 0)):
+        if mask.any():
+            errors[message] = np.broadcast_to(mask[:, None], values.shape).copy()
+    return BatchResult(values, errors)
+
+
+def solve_linear(a, b):
+    a, b = np.broadcast_arrays(_column(a), _column(b))
+    return roots(np.stack([a, b], axis=1))
+
+
+def solve_quadratic(a, b, c):
+    a, b, c = np.broadcast_arrays(_column(a), _column(b), _column(c))
+    return roots(np.stack([a, b, c], axis=1))
+
+
+OPERATIONS = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+    "power": power,
+    "sqrt": sqrt,
+    "sin": sin,
+    "cos": cos,
+    "tan": tan,
+    "ctg": ctg,
+    "deg_to_rad": deg_to_rad,
+    "rad_to_deg": rad_to_deg,
+    "logarithm": logarithm,
+    "integer": integer,
+    "fractional": fractional,
+    "solve_linear": solve_linear,
+    "solve_quadratic": solve_quadratic
+}
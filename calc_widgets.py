@@ -0,0 +1,87 @@
+import tkinter as tk
+from tkinter import ttk
+
+PAGE_SIZE = 100
+
+
+class VirtualList(tk.Frame):
+    def __init__(self, parent, row_height, fetch, create_row, fill_row, bg):
+        super().__init__(parent, bg=bg)
+        self.row_height = row_height
+        self.fetch = fetch
+        self.create_row = create_row
+        self.fill_row = fill_row
+
+        self.total = 0
+        self.top = 0
+        self.rows = []
+        self.pages = {}
+
+        self.body = tk.Frame(self, bg=bg)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+
+        self.body.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.body.bind('<Configure>', lambda e: self.redraw())
+        self.bind_scroll(self.body)
+
+    def bind_scroll(self, widget):
+        widget.bind('<MouseWheel>', lambda e: self.scroll(int(-1 * (e.delta / 120)) * 3))
+        widget.bind('<Button-4>', lambda e: self.scroll(-3))
+        widget.bind('<Button-5>', lambda e: self.scroll(3))
+
+    def scroll(self, rows):
+        self.top = max(0, min(self.top + rows, self.total - self.visible_count() + 1))
+        self.redraw()
+        return "break"
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * self.total)
+            self.scroll(0)
+        elif args[0] == 'scroll':
+            step = self.visible_count() - 1 if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def visible_count(self):
+        return max(self.body.winfo_height() // self.row_height, 1) + 1
+
+    def reset(self, total):
+        self.total = total
+        self.top = 0
+        self.pages.clear()
+        self.redraw()
+
+    def item(self, index):
+        page, offset = divmod(index, PAGE_SIZE)
+        if page not in self.pages:
+            if len(self.pages) > 8:
+                self.pages.clear()
+            self.pages[page] = self.fetch(page * PAGE_SIZE, PAGE_SIZE)
+        items = self.pages[page]
+        return items[offset] if offset < len(items) else None
+
+    def redraw(self):
+        count = self.visible_count()
+        while len(self.rows) < count:
+            row = self.create_row(self.body)
+            self.bind_scroll(row)
+            for child in row.winfo_children():
+                self.bind_scroll(child)
+            self.rows.append(row)
+
+        # Виджеты создаются только под видимые строки и переиспользуются при прокрутке
+        for i, row in enumerate(self.rows):
+            index = self.top + i
+            entry = self.item(index) if i < count and index < self.total else None
+            if entry is None:
+                row.place_forget()
+                continue
+            self.fill_row(row, entry)
+            row.place(x=0, y=i * self.row_height, relwidth=1, height=self.row_height - 6)
+
+        if self.total:
+            self.scrollbar.set(self.top / self.total, min((self.top + count - 1) / self.total, 1))
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,112 @@
+import multiprocessing
+import time
+
+TIMEOUT = 30.0
+TIMEOUTS = {
+    "factorial": 120.0,
+    "double_fact": 120.0,
+    "prime_factors": 300.0,
+    "is_prime": 60.0,
+    "lcm": 60.0
+}
+
+
+def _serve(connection, factor_path=None):
+    import calc_factor
+    from calc_engine import CalcEngine
+    from calc_precision import DIGITS, Precision
+
+    if factor_path is not None:
+        calc_factor.cache = calc_factor.FactorCache(path=factor_path)
+    engine = CalcEngine()
+    while True:
+        try:
+            name, args, precision, expressions = connection.recv()
+        except EOFError:
+            break
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            precision = precision or ("float", DIGITS)
+            if precision != engine.precision.key:
+                engine.precision = Precision(*precision)
+            if expressions:
+                # Поля ввода с вызовами операций; без имени операции возвращаются только их значения
+                args = tuple(engine.evaluate_expression(text) for text in args)
+            result = engine.evaluate(name, *args) if name is not None else args
+        except Exception as e:
+            connection.send((False, e, time.perf_counter() - wall, time.process_time() - cpu))
+            continue
+        connection.send((True, result, time.perf_counter() - wall, time.process_time() - cpu))
+
+
+class Worker:
+    # Отдельный процесс, а не поток: зависшее вычисление можно убить
+    def __init__(self, factor_path=None):
+        self.context = multiprocessing.get_context('spawn')
+        self.factor_path = factor_path
+        self.process = None
+        self.connection = None
+        self.started = None
+        self.deadline = None
+
+    @property
+    def busy(self):
+        return self.started is not None
+
+    def elapsed(self):
+        return time.monotonic() - self.started if self.busy else 0.0
+
+    def start(self):
+        if self.process is not None and self.process.is_alive():
+            return
+        self.connection, child = self.context.Pipe()
+        self.process = self.context.Process(target=_serve, args=(child, self.factor_path), name='calc-worker', daemon=True)
+        self.process.start()
+        child.close()
+
+    def submit(self, name, args, timeout=None, precision=None, expressions=False):
+        if self.busy:
+            raise ValueError("Предыдущее вычисление ещё не завершено")
+        if timeout is None:
+            timeout = TIMEOUTS.get(name, TIMEOUT)
+        self.start()
+        self.connection.send((name, args, precision.key if precision else None, expressions))
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout
+
+    def poll(self, wait=0):
+        # None - ещё считает; иначе (успех, результат или исключение, время, процессорное время)
+        if not self.busy:
+            return None
+        try:
+            if self.connection.poll(wait):
+                reply = self.connection.recv()
+                self.started = None
+                return reply
+        except (EOFError, OSError):
+            elapsed = self.elapsed()
+            self.stop()
+            return False, ValueError("Процесс вычисления завершился аварийно"), elapsed, None
+
+        elapsed = self.elapsed()
+        if not self.process.is_alive():
+            self.stop()
+            return False, ValueError("Процесс вычисления завершился аварийно"), elapsed, None
+        if time.monotonic() > self.deadline:
+            timeout = self.deadline - self.started
+            self.stop()
+            return False, TimeoutError(f"Превышено время вычисления ({timeout:g} с)"), elapsed, None
+        return None
+
+    def stop(self):
+        self.started = None
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join(1)
+            self.connection.close()
+        self.process = None
+        self.connection = None
+
+    def cancel(self):
+        if self.busy:
+            self.stop()
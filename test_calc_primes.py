@@ -0,0 +1,38 @@
+import pytest
+
+import calc_factor
+import calc_primes
+
+# Сильная псевдопростая по всем 13 свидетелям: 1287836182261 × 2575672364521
+PSEUDOPRIME = 3317044064679887385961981
+
+
+@pytest.fixture
+def factor_cache(monkeypatch):
+    monkeypatch.setattr(calc_factor, 'cache', calc_factor.FactorCache(path=None))
+
+
+def test_pseudoprime_above_witness_limit():
+    assert not calc_primes.is_prime(PSEUDOPRIME)
+
+
+def test_prime_factors_of_pseudoprime(factor_cache):
+    assert calc_factor.factorize(PSEUDOPRIME) == [1287836182261, 2575672364521]
+
+
+@pytest.mark.parametrize('exponent, prime', [
+    (61, True), (89, True), (101, False), (107, True), (127, True), (521, True)
+])
+def test_mersenne(exponent, prime):
+    assert calc_primes.is_prime(2 ** exponent - 1) is prime
+
+
+def test_strong_lucas_pseudoprimes():
+    # Известные сильные псевдопростые Люка (OEIS A217255): тест Люка сам по себе их пропускает
+    found = [n for n in range(3, 26000, 2) if calc_primes.strong_lucas(n) and n not in calc_primes.sieve]
+    assert found == [5459, 5777, 10877, 16109, 18971, 22499, 24569, 25199]
+
+
+def test_sieve_matches_miller_rabin():
+    for n in range(3, 20000, 2):
+        assert calc_primes.miller_rabin(n) == (n in calc_primes.sieve)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import calc_vector
+
+
+def assert_roots(row, values):
+    # Сопряжённые пары могут идти в любом порядке: каждому корню ищем ближайший из np.roots
+    expected = list(np.roots(row))
+    found = values[~np.isnan(values)]
+    assert len(found) == len(expected)
+    for root in found:
+        nearest = min(range(len(expected)), key=lambda i: abs(expected[i] - root))
+        assert abs(expected.pop(nearest) - root) <= 1e-6 * max(1, abs(root))
+
+
+@pytest.mark.parametrize('row', [
+    [1, 0, 0],
+    [2, 0, 0],
+    [1, -4, 4],
+    [0, 1, -3],
+    [0, 0, 2, 4],
+    [1, 0, 0, 0],
+    [1, 3, 3, 1],
+    [0, 1, 0, 1]
+])
+def test_roots_degenerate(row):
+    result = calc_vector.roots([row])
+    assert not result.errors
+    assert_roots(row, result.values[0])
+
+
+def test_roots_random():
+    rng = np.random.default_rng(20)
+    for degree in (1, 2, 3, 5):
+        rows = rng.uniform(-10, 10, (200, degree + 1))
+        result = calc_vector.roots(rows)
+        for row, values in zip(rows, result.values):
+            assert_roots(row, values)
+
+
+def test_solve_quadratic_zero_coefficients():
+    values, mask = calc_vector.solve_quadratic([1, 2], [0, 0], [0, 0])
+    assert not mask.any()
+    np.testing.assert_array_equal(values, np.zeros((2, 2)))
+
+
+def test_roots_errors():
+    result = calc_vector.roots([[0, 0, 0], [0, 0, 5]])
+    assert result.errors[calc_vector.INFINITE_SOLUTIONS][0].all()
+    assert result.errors[calc_vector.NO_SOLUTIONS][1].all()
+
+
+def test_power_zero_to_negative():
+    result = calc_vector.power([0, 0, 2], [-1, 2, -1])
+    np.testing.assert_array_equal(result.errors[calc_vector.ZERO_DIVISION], [True, False, False])
+    assert calc_vector.CALC_ERROR not in result.errors
+    np.testing.assert_array_equal(result.values[1:], [0, 0.5])